@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+API Benchmarks: end-to-end /predict through the ASGI app in-process
+
+Requests are driven straight through the ASGI interface (no sockets,
+no extra HTTP client dependency), so the numbers cover routing,
+Pydantic validation, inference and JSON encoding.
+"""
+
+from typing import Dict, Sequence, Tuple
+import asyncio
+import json
+import time
+import numpy as np
+
+from benchmarks.harness import case_name, summarize
+from models.registry import get_model_registry
+
+
+async def asgi_post(app, path: str, payload: dict) -> Tuple[int, bytes]:
+    """Send one JSON POST through an ASGI app and return (status, body)"""
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+    request_sent = False
+    status = 0
+    chunks = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)  # no disconnect while the response is produced
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+async def _run_level(app, concurrency: int, requests: int, payloads: list) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(payload):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter_ns()
+            status, _ = await asgi_post(app, "/predict", payload)
+            latencies.append(time.perf_counter_ns() - start)
+            if status != 200:
+                errors += 1
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(one(payloads[i % len(payloads)]) for i in range(requests)))
+    result = summarize(latencies, wall_s=time.perf_counter() - wall)
+    result["errors"] = errors
+    return result
+
+
+async def _run(models: Sequence[str], levels: Sequence[int], requests: int) -> Dict[str, dict]:
+    from server.api import app
+
+    rng = np.random.default_rng(0)
+    payloads = [
+        {"tonic": t, "octave": o, "fifth": f}
+        for t, o, f in np.round(rng.uniform(-50, 50, size=(1000, 3)), 2).tolist()
+    ]
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        for name in models:
+            get_model_registry().set_active(name)
+            await _run_level(app, 1, min(requests, 200), payloads)  # warm-up
+            for level in levels:
+                results[case_name("api", name, f"predict[c={level}]")] = await _run_level(
+                    app, level, requests, payloads
+                )
+    return results
+
+
+def run(models: Sequence[str], levels: Sequence[int] = (1, 8, 32), requests: int = 2000) -> Dict[str, dict]:
+    registry = get_model_registry()
+    previous = registry.active_name
+    try:
+        return asyncio.run(_run(models, levels, requests))
+    finally:
+        registry.set_active(previous)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Hit Model Benchmarks: scalar/batch predict, registry cold vs. warm path,
+coordinate solver and impact-power engine
+"""
+
+from typing import Dict, Sequence
+import numpy as np
+
+from benchmarks.harness import case_name, time_calls
+from models.registry import build_default_registry, get_model_registry
+from models.tonefield_solver import solve
+from models.impact_power import solve_impact
+
+
+def _inputs(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).uniform(-50.0, 50.0, size=(3, n))
+
+
+def bench_model(name: str, repeat: int, batch_size: int) -> Dict[str, dict]:
+    """Scalar and batch predict for one registered model"""
+    model = get_model_registry().get(name)
+    scalar = _inputs(repeat + 1000).T.tolist()
+    it = iter(scalar)
+
+    def predict_one():
+        model.predict(*next(it))
+
+    batch = _inputs(batch_size, seed=1)
+    return {
+        case_name("model", name, "predict"): time_calls(predict_one, repeat),
+        case_name("model", name, f"predict_batch[{batch_size}]"): time_calls(
+            lambda: model.predict_batch(*batch), max(repeat // 100, 20), items_per_op=batch_size
+        ),
+    }
+
+
+def bench_registry(name: str, repeat: int) -> Dict[str, dict]:
+    """get_active() on a fresh registry (build + first use) vs. an existing one"""
+    def cold():
+        registry = build_default_registry()
+        registry.set_active(name)
+
+    warm_registry = build_default_registry()
+    warm_registry.set_active(name)
+    return {
+        case_name("registry", name, "cold"): time_calls(cold, max(repeat // 100, 10), warmup=1),
+        case_name("registry", name, "warm"): time_calls(warm_registry.get_active, repeat),
+    }
+
+
+def bench_engines(repeat: int, batch_size: int) -> Dict[str, dict]:
+    """Tonefield coordinate solver and impact-power engine over arrays"""
+    batch = _inputs(batch_size, seed=2)
+    single = _inputs(1, seed=3)
+    runs = max(repeat // 100, 20)
+    return {
+        case_name("engine", "tonefield_solve", "single"): time_calls(lambda: solve(*single), repeat // 10),
+        case_name("engine", "tonefield_solve", f"batch[{batch_size}]"): time_calls(
+            lambda: solve(*batch), runs, items_per_op=batch_size
+        ),
+        case_name("engine", "impact_power", f"batch[{batch_size}]"): time_calls(
+            lambda: solve_impact(*batch), runs, items_per_op=batch_size
+        ),
+    }
+
+
+def run(models: Sequence[str], repeat: int = 10000, batch_size: int = 10000) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+    for name in models:
+        results.update(bench_model(name, repeat, batch_size))
+        results.update(bench_registry(name, repeat))
+    results.update(bench_engines(repeat, batch_size))
+    return results
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark Harness: Timing, statistics, result files and baseline comparison
+"""
+
+from typing import Callable, Dict, List, Optional
+from datetime import datetime, timezone
+from pathlib import Path
+import json
+import platform
+import time
+import numpy as np
+
+
+DEFAULT_REGRESSION_THRESHOLD = 0.10  # 10% slower throughput or p99 counts as regression
+
+
+def summarize(latencies_ns: List[int], items_per_op: int = 1, wall_s: Optional[float] = None) -> Dict[str, float]:
+    """
+    Throughput and latency percentiles from per-operation timings
+
+    wall_s overrides the summed latencies as elapsed time (needed when
+    operations overlap, e.g. concurrent requests).
+    """
+    lat = np.asarray(latencies_ns, dtype=np.float64) / 1e3  # us
+    total_s = wall_s if wall_s is not None else lat.sum() / 1e6
+    return {
+        "ops": int(lat.size),
+        "items_per_op": items_per_op,
+        "throughput": (lat.size * items_per_op) / total_s if total_s > 0 else float('inf'),
+        "mean_us": float(lat.mean()),
+        "p50_us": float(np.percentile(lat, 50)),
+        "p99_us": float(np.percentile(lat, 99)),
+        "max_us": float(lat.max())
+    }
+
+
+def time_calls(fn: Callable[[], object], repeat: int, warmup: int = 10, items_per_op: int = 1) -> Dict[str, float]:
+    """Time fn() individually `repeat` times after `warmup` untimed calls"""
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        start = clock()
+        fn()
+        latencies.append(clock() - start)
+    return summarize(latencies, items_per_op)
+
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine()
+    }
+
+
+def write_results(path: Path, results: Dict[str, dict]):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"environment": environment(), "results": results}, indent=2),
+                    encoding='utf-8')
+
+
+def load_results(path: Path) -> Dict[str, dict]:
+    return json.loads(Path(path).read_text(encoding='utf-8'))["results"]
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict],
+            threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[dict]:
+    """
+    Compare two result sets case by case
+
+    A case regresses when throughput falls or p99 latency rises by more
+    than `threshold` (relative) against the baseline.
+    """
+    rows = []
+    for case in sorted(set(current) & set(baseline)):
+        cur, base = current[case], baseline[case]
+        throughput_change = cur["throughput"] / base["throughput"] - 1.0
+        p99_change = cur["p99_us"] / base["p99_us"] - 1.0 if base["p99_us"] else 0.0
+        rows.append({
+            "case": case,
+            "throughput_change": throughput_change,
+            "p50_change": cur["p50_us"] / base["p50_us"] - 1.0 if base["p50_us"] else 0.0,
+            "p99_change": p99_change,
+            "regression": throughput_change < -threshold or p99_change > threshold
+        })
+    return rows
+
+
+def format_results(results: Dict[str, dict]) -> str:
+    lines = [f"{'case':<48} {'throughput/s':>14} {'p50 us':>10} {'p99 us':>10}"]
+    for case, r in results.items():
+        lines.append(f"{case:<48} {r['throughput']:>14,.0f} {r['p50_us']:>10.1f} {r['p99_us']:>10.1f}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[dict]) -> str:
+    lines = [f"{'case':<48} {'throughput':>11} {'p50':>9} {'p99':>9}"]
+    for r in rows:
+        flag = "  REGRESSION" if r["regression"] else ""
+        lines.append(
+            f"{r['case']:<48} {r['throughput_change']:>+10.1%} {r['p50_change']:>+8.1%} "
+            f"{r['p99_change']:>+8.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def case_name(*parts: Optional[str]) -> str:
+    return "/".join(p for p in parts if p)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark Runner: Measure hit model and API hot paths
+
+Usage:
+    python -m benchmarks.run --models dummy tonefield --output bench/results.json
+    python -m benchmarks.run --compare bench/baseline.json
+
+With --compare the run exits with status 1 when any case regresses
+(throughput or p99 latency worse than --threshold).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks import bench_api, bench_hit_model
+from benchmarks.harness import (
+    DEFAULT_REGRESSION_THRESHOLD,
+    compare,
+    format_comparison,
+    format_results,
+    load_results,
+    write_results,
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tuning Lab benchmarks")
+    parser.add_argument("--models", nargs="+", default=["dummy", "tonefield"],
+                        help="Registered model names to benchmark")
+    parser.add_argument("--repeat", type=int, default=10000, help="Scalar calls per case")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows per batch call")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32],
+                        help="Concurrency levels for the /predict benchmark")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per concurrency level")
+    parser.add_argument("--skip-api", action="store_true", help="Skip end-to-end API benchmarks")
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"),
+                        help="Result JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Relative change counted as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    results = bench_hit_model.run(args.models, args.repeat, args.batch_size)
+    if not args.skip_api:
+        results.update(bench_api.run(args.models, args.concurrency, args.requests))
+
+    write_results(args.output, results)
+    print(format_results(results))
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        rows = compare(results, load_results(args.compare), args.threshold)
+        print(f"\nComparison against {args.compare}:")
+        print(format_comparison(rows))
+        if any(r["regression"] for r in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
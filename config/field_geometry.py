@@ -3,14 +3,39 @@
 Field Geometry Configuration: Tonefield coordinate system settings
 
 Define and manage tonefield geometry for each note
+
+Per-note geometries for a whole instrument are loaded from a YAML/JSON
+file (TUNING_LAB_GEOMETRY_FILE, default: data/geometries.yaml):
+
+    instrument: D Kurd 9
+    default:
+      field_size: 100.0
+      ellipse: {center_x: 0, center_y: 0, semi_major: 40, semi_minor: 30, rotation: 0}
+    notes:
+      D3:
+        field_size: 120.0
+        ellipse: {center_x: 0, center_y: 0, semi_major: 52, semi_minor: 38, rotation: 0}
+        scale_factor: 1.0
 """
 
-from typing import Dict, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+import asyncio
+import hashlib
 import json
+import logging
+import os
+import threading
+
+
+GEOMETRY_FILE_ENV_VAR = "TUNING_LAB_GEOMETRY_FILE"
+DEFAULT_GEOMETRY_FILE = Path(__file__).parent.parent / "data" / "geometries.yaml"
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class EllipseParams:
     """Ellipse parameters"""
     center_x: float
@@ -20,41 +45,82 @@ class EllipseParams:
     rotation: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TonefieldGeometry:
-    """Tonefield coordinate system geometry"""
+    """Tonefield coordinate system geometry (immutable, hashable)"""
     field_size: float
     ellipse: EllipseParams
     scale_factor: float = 1.0
+    _content_hash: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        canonical = json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':'))
+        object.__setattr__(self, '_content_hash', hashlib.sha256(canonical.encode('utf-8')).hexdigest())
+
+    def content_hash(self) -> str:
+        """Stable SHA-256 of the geometry values (cache key for derived data)"""
+        return self._content_hash
 
     def to_dict(self) -> dict:
         return {
-            'field_size': self.field_size,
+            'field_size': float(self.field_size),
             'ellipse': {
-                'center_x': self.ellipse.center_x,
-                'center_y': self.ellipse.center_y,
-                'semi_major': self.ellipse.semi_major,
-                'semi_minor': self.ellipse.semi_minor,
-                'rotation': self.ellipse.rotation
+                'center_x': float(self.ellipse.center_x),
+                'center_y': float(self.ellipse.center_y),
+                'semi_major': float(self.ellipse.semi_major),
+                'semi_minor': float(self.ellipse.semi_minor),
+                'rotation': float(self.ellipse.rotation)
             },
-            'scale_factor': self.scale_factor
+            'scale_factor': float(self.scale_factor)
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'TonefieldGeometry':
-        ellipse = EllipseParams(**data['ellipse'])
+        ellipse = EllipseParams(**{k: float(v) for k, v in data['ellipse'].items()})
         return cls(
-            field_size=data['field_size'],
+            field_size=float(data['field_size']),
             ellipse=ellipse,
-            scale_factor=data.get('scale_factor', 1.0)
+            scale_factor=float(data.get('scale_factor', 1.0))
         )
 
 
+def load_geometry_file(path: Path) -> Tuple[Optional[str], Optional[TonefieldGeometry], Dict[str, TonefieldGeometry]]:
+    """
+    Parse an instrument geometry file (.yaml/.yml or .json)
+
+    Returns:
+        Tuple[instrument name, default geometry or None, geometries by note]
+    """
+    path = Path(path)
+    text = path.read_text(encoding='utf-8')
+    if path.suffix.lower() in ('.yaml', '.yml'):
+        import yaml
+        data = yaml.safe_load(text) or {}
+    else:
+        data = json.loads(text)
+
+    default = data.get('default')
+    notes = {
+        str(name): TonefieldGeometry.from_dict(geometry)
+        for name, geometry in (data.get('notes') or {}).items()
+    }
+    return (
+        data.get('instrument'),
+        TonefieldGeometry.from_dict(default) if default else None,
+        notes
+    )
+
+
 class GeometryConfig:
-    """Tonefield geometry configuration manager"""
+    """
+    Tonefield geometry configuration manager
+
+    The note -> geometry mapping is replaced as a whole (copy-on-write),
+    so readers never see a half-loaded instrument.
+    """
 
     def __init__(self):
-        self._default_geometry = TonefieldGeometry(
+        self._builtin_default = TonefieldGeometry(
             field_size=100.0,
             ellipse=EllipseParams(
                 center_x=0.0,
@@ -65,18 +131,76 @@ class GeometryConfig:
             ),
             scale_factor=1.0
         )
+        self._default_geometry = self._builtin_default
         self._geometries: Dict[str, TonefieldGeometry] = {}
+        self._lock = threading.Lock()
+        self.instrument: Optional[str] = None
+        self.source: Optional[Path] = None
+        # Incremented on every change so caches can detect stale entries
+        self.version = 0
 
     def get_geometry(self, note_name: str = 'default') -> TonefieldGeometry:
+        """Geometry for a note (the default geometry for unknown notes)"""
         if note_name == 'default' or note_name not in self._geometries:
             return self._default_geometry
         return self._geometries[note_name]
 
-    def set_geometry(self, note_name: str, geometry: TonefieldGeometry):
-        self._geometries[note_name] = geometry
+    def has_geometry(self, note_name: str) -> bool:
+        return note_name in self._geometries
 
+    def notes(self) -> List[str]:
+        return sorted(self._geometries)
 
-_config = GeometryConfig()
+    def set_geometry(self, note_name: str, geometry: TonefieldGeometry):
+        with self._lock:
+            self._geometries = dict(self._geometries, **{note_name: geometry})
+            self.version += 1
+
+    def load(self, path: Path):
+        """Replace all geometries with the contents of an instrument file"""
+        instrument, default, geometries = load_geometry_file(path)
+        with self._lock:
+            self._default_geometry = default or self._builtin_default
+            self._geometries = geometries
+            self.instrument = instrument
+            self.source = Path(path)
+            self.version += 1
+
+    async def watch(self, path: Optional[Path] = None, stop_event: Optional[asyncio.Event] = None):
+        """
+        Reload the instrument file whenever it changes (until stop_event is set)
+
+        The parent directory is watched so editors that save by
+        replacing the file are picked up. A file that fails to parse
+        leaves the current geometries in place.
+        """
+        from watchfiles import awatch
+
+        path = Path(path or self.source).resolve()
+        async for _ in awatch(
+            path.parent,
+            watch_filter=lambda change, changed: Path(changed).resolve() == path,
+            stop_event=stop_event
+        ):
+            try:
+                self.load(path)
+                logger.info("Reloaded %d note geometries from %s", len(self._geometries), path)
+            except Exception as e:
+                logger.error("Keeping previous geometries, failed to load %s: %s", path, e)
+
+
+def _config_from_env() -> GeometryConfig:
+    config = GeometryConfig()
+    path = Path(os.environ.get(GEOMETRY_FILE_ENV_VAR, DEFAULT_GEOMETRY_FILE))
+    if path.exists():
+        try:
+            config.load(path)
+        except Exception as e:
+            logger.error("Using the built-in default geometry, failed to load %s: %s", path, e)
+    return config
+
+
+_config = _config_from_env()
 
 
 def get_geometry_config() -> GeometryConfig:
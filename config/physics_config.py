@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Physics Configuration: Machine calibration constants for impact calculation
+
+Python mirror of PHYSICS_CONFIG in tuning-console/lib/TuningPhysicsConfig.ts
+
+Fitted constants (models.calibration) are stored as numbered files
+config/calibrations/physics_config.vNNNN.json. At startup the highest
+version is loaded (TUNING_LAB_CALIBRATION_VERSION pins a version,
+'none' keeps the built-in defaults).
+"""
+
+from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+import json
+import logging
+import os
+import re
+
+
+@dataclass(frozen=True)
+class HammeringRules:
+    """Hammering type thresholds (Hz)"""
+    internal_snap_limit: float = 1.0    # internal: <= 1.0 SNAP
+    internal_press_start: float = 10.0  # internal: >= 10.0 PRESS (PULL in between)
+    external_snap_limit: float = 5.0    # external: <= 5.0 SNAP (PRESS above)
+
+
+@dataclass(frozen=True)
+class PhysicsConfig:
+    """Impact physics constants"""
+    threshold_c: float = 20.0      # minimum strength that starts deformation
+    scaling_s: float = 30.0        # Hz -> strength sensitivity
+    safety_ratio: float = 2.1      # LIMIT = threshold_c * safety_ratio (SUS430)
+    tonefield_radius_x: float = 0.6   # short axis (fifth)
+    tonefield_radius_y: float = 0.85  # long axis (tonic/octave)
+    stiffness_k: Tuple[float, float, float] = (1.0, 0.9, 1.2)  # tonic, octave, fifth
+    hammering: HammeringRules = field(default_factory=HammeringRules)
+
+    @property
+    def limit(self) -> float:
+        return self.threshold_c * self.safety_ratio
+
+    def to_dict(self) -> dict:
+        return {
+            'threshold_c': self.threshold_c,
+            'scaling_s': self.scaling_s,
+            'safety_ratio': self.safety_ratio,
+            'tonefield_radius_x': self.tonefield_radius_x,
+            'tonefield_radius_y': self.tonefield_radius_y,
+            'stiffness_k': {
+                'tonic': self.stiffness_k[0],
+                'octave': self.stiffness_k[1],
+                'fifth': self.stiffness_k[2]
+            },
+            'hammering': {
+                'internal_snap_limit': self.hammering.internal_snap_limit,
+                'internal_press_start': self.hammering.internal_press_start,
+                'external_snap_limit': self.hammering.external_snap_limit
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PhysicsConfig':
+        defaults = cls()
+        stiffness = data.get('stiffness_k', {})
+        return cls(
+            threshold_c=data.get('threshold_c', defaults.threshold_c),
+            scaling_s=data.get('scaling_s', defaults.scaling_s),
+            safety_ratio=data.get('safety_ratio', defaults.safety_ratio),
+            tonefield_radius_x=data.get('tonefield_radius_x', defaults.tonefield_radius_x),
+            tonefield_radius_y=data.get('tonefield_radius_y', defaults.tonefield_radius_y),
+            stiffness_k=(
+                stiffness.get('tonic', defaults.stiffness_k[0]),
+                stiffness.get('octave', defaults.stiffness_k[1]),
+                stiffness.get('fifth', defaults.stiffness_k[2])
+            ),
+            hammering=HammeringRules(**data.get('hammering', {}))
+        )
+
+
+CALIBRATION_DIR_ENV_VAR = "TUNING_LAB_CALIBRATION_DIR"
+CALIBRATION_VERSION_ENV_VAR = "TUNING_LAB_CALIBRATION_VERSION"
+DEFAULT_CALIBRATION_DIR = Path(__file__).parent / "calibrations"
+_CALIBRATION_FILE = re.compile(r"^physics_config\.v(\d{4,})\.json$")
+
+logger = logging.getLogger(__name__)
+
+
+def calibration_dir() -> Path:
+    return Path(os.environ.get(CALIBRATION_DIR_ENV_VAR, DEFAULT_CALIBRATION_DIR))
+
+
+def list_calibrations(directory: Optional[Path] = None) -> List[int]:
+    """Stored calibration versions, oldest first"""
+    directory = Path(directory or calibration_dir())
+    if not directory.is_dir():
+        return []
+    matches = (_CALIBRATION_FILE.match(p.name) for p in directory.iterdir())
+    return sorted(int(m.group(1)) for m in matches if m)
+
+
+def load_calibration(version: Optional[int] = None, directory: Optional[Path] = None) -> Tuple[PhysicsConfig, dict]:
+    """
+    Load a stored calibration (latest by default)
+
+    Returns:
+        Tuple[PhysicsConfig, full calibration record (version, fit report, ...)]
+    """
+    directory = Path(directory or calibration_dir())
+    versions = list_calibrations(directory)
+    if version is None:
+        if not versions:
+            raise FileNotFoundError(f"No calibrations in {directory}")
+        version = versions[-1]
+    path = directory / f"physics_config.v{version:04d}.json"
+    record = json.loads(path.read_text(encoding='utf-8'))
+    return PhysicsConfig.from_dict(record['config']), record
+
+
+def save_calibration(config: PhysicsConfig, report: dict, directory: Optional[Path] = None) -> int:
+    """Store a calibration under the next version number (never overwrites); returns the version"""
+    directory = Path(directory or calibration_dir())
+    directory.mkdir(parents=True, exist_ok=True)
+    while True:
+        versions = list_calibrations(directory)
+        version = (versions[-1] if versions else 0) + 1
+        record = {'version': version, 'config': config.to_dict(), 'report': report}
+        try:
+            with open(directory / f"physics_config.v{version:04d}.json", 'x', encoding='utf-8') as f:
+                json.dump(record, f, indent=2, ensure_ascii=False)
+            return version
+        except FileExistsError:
+            continue  # another writer took this version
+
+
+def _config_from_env() -> Tuple[PhysicsConfig, Optional[int]]:
+    pinned = os.environ.get(CALIBRATION_VERSION_ENV_VAR)
+    if pinned and pinned.lower() == 'none':
+        return PhysicsConfig(), None
+    try:
+        config, record = load_calibration(int(pinned) if pinned else None)
+        return config, record['version']
+    except FileNotFoundError:
+        if pinned:
+            raise
+        return PhysicsConfig(), None
+    except (ValueError, KeyError) as e:
+        logger.error("Using built-in physics constants, failed to load calibration: %s", e)
+        return PhysicsConfig(), None
+
+
+_config, _calibration_version = _config_from_env()
+
+
+def get_physics_config() -> PhysicsConfig:
+    return _config
+
+
+def get_calibration_version() -> Optional[int]:
+    """Version of the loaded calibration (None: built-in defaults or set_physics_config)"""
+    return _calibration_version
+
+
+def set_physics_config(config: PhysicsConfig, calibration_version: Optional[int] = None):
+    global _config, _calibration_version
+    _config = config
+    _calibration_version = calibration_version
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+Calibration: Fit physics constants to recorded hits
+
+Fits the constants the spec marks for calibration from measured data
+(THRESHOLD_C, SCALING_S, STIFFNESS_K and the hammering thresholds) to
+the force / hit count / hammering type technicians actually used, as
+stored in the hit_points table.
+
+Force model (models.impact_power), per recorded hit i:
+    force_i = C + sqrt(effective_hz_i * S * K[mode_i]) / sqrt(count_i)
+S and K only appear as products S * K[mode], so K_tonic is kept at its
+current value as the reference and S, K_octave, K_fifth, C are fitted
+with scipy.optimize.least_squares (robust soft-L1 loss, analytic
+Jacobian, vectorized over the whole dataset) from several Latin
+hypercube starts spread over a process pool. Hits at the 10-hit cap
+are recorded at LIMIT and are left out of the force fit.
+
+Hammering thresholds are fitted exactly: the best split points on the
+sorted |Hz| values are found from cumulative class counts in O(n log n).
+
+The fitted config is written as the next config/calibrations version,
+which the engine and API load at startup (config.physics_config).
+
+Usage:
+    python -m models.calibration [--starts 32] [--workers 8] [--dry-run]
+"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timezone
+import time
+import numpy as np
+from scipy.optimize import least_squares
+from scipy.stats import qmc
+
+from config.physics_config import HammeringRules, PhysicsConfig, get_physics_config, save_calibration
+from models.impact_power import (
+    HAMMERING_TYPE_NAMES, MAX_HIT_COUNT, PRESS, PULL, SNAP, calculate_impact_power, pure_energy
+)
+from models.tonefield_solver import TARGET_NAMES
+
+
+# Parameter vector: (threshold_c, scaling_s, k_octave, k_fifth)
+PARAMETER_NAMES = ("threshold_c", "scaling_s", "k_octave", "k_fifth")
+LOWER_BOUNDS = np.array([5.0, 5.0, 0.2, 0.2])
+UPPER_BOUNDS = np.array([40.0, 100.0, 5.0, 5.0])
+DEFAULT_STARTS = 16
+
+_LOADED_COLUMNS = (
+    "tonic", "octave", "fifth", "coordinate_x", "coordinate_y",
+    "primary_target", "strength", "hit_count", "hammering_type",
+)
+
+
+class HitDataset(NamedTuple):
+    """Recorded hits as arrays of shape (n,)"""
+    raw_hz: np.ndarray       # signed error of the primary target
+    x: np.ndarray            # recorded hit point, short axis
+    y: np.ndarray            # recorded hit point, long axis
+    mode: np.ndarray         # primary target code
+    force: np.ndarray        # recorded force per hit
+    count: np.ndarray        # recorded hit count
+    hammering: np.ndarray    # recorded hammering type code (-1: unknown)
+
+
+def load_hit_dataset(repository=None) -> HitDataset:
+    """Recorded hits with force and hit count from the hit_points repository"""
+    from storage.hit_points_repository import get_hit_points_repository
+
+    repository = repository or get_hit_points_repository()
+    target_codes = {name: code for code, name in enumerate(TARGET_NAMES)}
+    type_codes = {name: code for code, name in enumerate(HAMMERING_TYPE_NAMES)}
+
+    chunks = []
+    for rows in repository.iter_columns(_LOADED_COLUMNS):
+        rows = [r for r in rows if r[5] in target_codes and r[6] is not None and r[7]]
+        if rows:
+            chunks.append(np.array([
+                (*r[:5], target_codes[r[5]], r[6], r[7], type_codes.get(r[8], -1)) for r in rows
+            ], dtype=np.float64))
+    data = np.concatenate(chunks) if chunks else np.empty((0, 9))
+
+    mode = data[:, 5].astype(np.int64)
+    errors = data[:, :3]
+    return HitDataset(
+        raw_hz=errors[np.arange(len(data)), mode],
+        x=data[:, 3],
+        y=data[:, 4],
+        mode=mode,
+        force=data[:, 6],
+        count=data[:, 7].astype(np.int64),
+        hammering=data[:, 8].astype(np.int64),
+    )
+
+
+class ForceProblem:
+    """Vectorized residuals and Jacobian of the force model"""
+
+    def __init__(self, data: HitDataset, config: PhysicsConfig):
+        # At the cap the recorded force is LIMIT, not the model force
+        uncapped = data.count < MAX_HIT_COUNT
+        self.k_tonic = config.stiffness_k[0]
+        self.force = data.force[uncapped]
+        self.mode = data.mode[uncapped]
+        # sqrt(effective_hz / count): the only per-hit factor the parameters multiply
+        unit = replace(config, scaling_s=1.0, stiffness_k=(1.0, 1.0, 1.0))
+        root_hz = pure_energy(data.raw_hz, data.x, data.y, data.mode, unit)
+        self.factor = root_hz[uncapped] / np.sqrt(data.count[uncapped])
+        self.one_hot = np.eye(3)[self.mode]
+
+    def _stiffness(self, theta: np.ndarray) -> np.ndarray:
+        return np.array([self.k_tonic, theta[2], theta[3]])[self.mode]
+
+    def residuals(self, theta: np.ndarray) -> np.ndarray:
+        c, s = theta[0], theta[1]
+        return c + self.factor * np.sqrt(s * self._stiffness(theta)) - self.force
+
+    def jacobian(self, theta: np.ndarray) -> np.ndarray:
+        s = theta[1]
+        k = self._stiffness(theta)
+        root = np.sqrt(s * k)
+        jac = np.empty((len(self.force), 4))
+        jac[:, 0] = 1.0
+        jac[:, 1] = self.factor * root / (2.0 * s)
+        d_k = self.factor * root / (2.0 * k)
+        jac[:, 2] = d_k * self.one_hot[:, 1]
+        jac[:, 3] = d_k * self.one_hot[:, 2]
+        return jac
+
+    def solve(self, start: np.ndarray) -> Tuple[np.ndarray, float]:
+        result = least_squares(
+            self.residuals, start, jac=self.jacobian,
+            bounds=(LOWER_BOUNDS, UPPER_BOUNDS), loss="soft_l1", f_scale=1.0
+        )
+        return result.x, float(result.cost)
+
+
+_worker_problem: Optional[ForceProblem] = None
+
+
+def _init_worker(data: HitDataset, config: PhysicsConfig):
+    global _worker_problem
+    _worker_problem = ForceProblem(data, config)
+
+
+def _solve_from(start: np.ndarray) -> Tuple[np.ndarray, float]:
+    return _worker_problem.solve(start)
+
+
+def fit_force_constants(
+    data: HitDataset,
+    config: PhysicsConfig,
+    starts: int = DEFAULT_STARTS,
+    workers: Optional[int] = None,
+    seed: int = 0
+) -> Tuple[np.ndarray, float]:
+    """
+    Multi-start robust least squares over a process pool
+
+    The dataset is shipped once per worker (pool initializer); tasks
+    only carry their start point. The current constants are always one
+    of the starts.
+
+    Returns:
+        Tuple[best parameter vector, its cost]
+    """
+    current = np.clip(
+        [config.threshold_c, config.scaling_s, config.stiffness_k[1], config.stiffness_k[2]],
+        LOWER_BOUNDS, UPPER_BOUNDS
+    )
+    sampler = qmc.LatinHypercube(d=len(PARAMETER_NAMES), seed=seed)
+    points = [current] + list(qmc.scale(sampler.random(max(starts - 1, 0)), LOWER_BOUNDS, UPPER_BOUNDS))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data, config)) as pool:
+        results = list(pool.map(_solve_from, points))
+    return min(results, key=lambda r: r[1])
+
+
+def _split_value(values: np.ndarray, k: int) -> float:
+    """Threshold between sorted values[k - 1] and values[k]"""
+    if k <= 0:
+        return float(values[0] / 2.0)
+    if k >= len(values):
+        return float(values[-1])
+    return float((values[k - 1] + values[k]) / 2.0)
+
+
+def fit_hammering_rules(data: HitDataset, rules: HammeringRules) -> HammeringRules:
+    """
+    Thresholds maximizing agreement with the recorded hammering types
+
+    internal (Hz < 0): SNAP <= a < PULL < b <= PRESS
+    external (Hz > 0): SNAP <= c < PRESS
+    """
+    known = data.hammering >= 0
+    abs_hz = np.abs(data.raw_hz)
+
+    internal_snap, internal_press = rules.internal_snap_limit, rules.internal_press_start
+    inside = known & (data.raw_hz < 0)
+    if inside.any():
+        order = np.argsort(abs_hz[inside], kind="stable")
+        values, types = abs_hz[inside][order], data.hammering[inside][order]
+        zero = np.zeros(1)
+        snap = np.concatenate([zero, np.cumsum(types == SNAP)])
+        pull = np.concatenate([zero, np.cumsum(types == PULL)])
+        press = np.concatenate([zero, np.cumsum(types == PRESS)])
+        # score(i, j) = snap[i] + pull[j] - pull[i] + press[n] - press[j], i <= j
+        tail = pull - press
+        best_tail = np.maximum.accumulate(tail[::-1])[::-1]  # max over j >= i
+        i = int(np.argmax(snap - pull + best_tail))
+        j = i + int(np.argmax(tail[i:]))
+        internal_snap, internal_press = _split_value(values, i), _split_value(values, j)
+
+    external_snap = rules.external_snap_limit
+    outside = known & (data.raw_hz > 0)
+    if outside.any():
+        order = np.argsort(abs_hz[outside], kind="stable")
+        values, types = abs_hz[outside][order], data.hammering[outside][order]
+        zero = np.zeros(1)
+        snap = np.concatenate([zero, np.cumsum(types == SNAP)])
+        press = np.concatenate([zero, np.cumsum(types == PRESS)])
+        i = int(np.argmax(snap - press))
+        external_snap = _split_value(values, i)
+
+    return HammeringRules(
+        internal_snap_limit=internal_snap,
+        internal_press_start=max(internal_press, internal_snap),
+        external_snap_limit=external_snap,
+    )
+
+
+def evaluate(data: HitDataset, config: PhysicsConfig) -> Dict[str, float]:
+    """Agreement of a config with the recorded hits"""
+    impact = calculate_impact_power(data.raw_hz, data.x, data.y, data.mode, config)
+    known = data.hammering >= 0
+    return {
+        "force_rmse": float(np.sqrt(np.mean((impact.force - data.force) ** 2))) if len(data.force) else 0.0,
+        "hit_count_accuracy": float(np.mean(impact.count == data.count)) if len(data.count) else 0.0,
+        "hammering_accuracy": float(np.mean(impact.hammering_type[known] == data.hammering[known])) if known.any() else 0.0,
+    }
+
+
+def calibrate(
+    data: HitDataset,
+    config: Optional[PhysicsConfig] = None,
+    starts: int = DEFAULT_STARTS,
+    workers: Optional[int] = None,
+    seed: int = 0
+) -> Tuple[PhysicsConfig, dict]:
+    """
+    Fit constants to recorded hits
+
+    Returns:
+        Tuple[fitted PhysicsConfig, report (dataset size, parameters, before/after metrics)]
+    """
+    config = config or get_physics_config()
+    if len(data.force) < len(PARAMETER_NAMES):
+        raise ValueError(f"Need at least {len(PARAMETER_NAMES)} recorded hits, got {len(data.force)}")
+
+    start = time.perf_counter()
+    theta, cost = fit_force_constants(data, config, starts, workers, seed)
+    fitted = replace(
+        config,
+        threshold_c=float(theta[0]),
+        scaling_s=float(theta[1]),
+        stiffness_k=(config.stiffness_k[0], float(theta[2]), float(theta[3])),
+    )
+    fitted = replace(fitted, hammering=fit_hammering_rules(data, config.hammering))
+
+    report = {
+        "fitted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "dataset_size": int(len(data.force)),
+        "starts": starts,
+        "cost": cost,
+        "parameters": dict(zip(PARAMETER_NAMES, map(float, theta))),
+        "before": evaluate(data, config),
+        "after": evaluate(data, fitted),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    return fitted, report
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Fit physics constants to recorded hits")
+    parser.add_argument("--starts", type=int, default=DEFAULT_STARTS, help="Multi-start count")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing a calibration")
+    args = parser.parse_args()
+
+    dataset = load_hit_dataset()
+    fitted, report = calibrate(dataset, starts=args.starts, workers=args.workers, seed=args.seed)
+    print(json.dumps({"config": fitted.to_dict(), "report": report}, indent=2, ensure_ascii=False))
+    if not args.dry_run:
+        print(f"Saved calibration v{save_calibration(fitted, report):04d}")
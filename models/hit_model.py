@@ -6,8 +6,12 @@ Input: (tonic, octave, fifth) - tuning error values (cents)
 Output: (L, S, strength) - tonefield coordinates (L, S) and hit strength
 """
 
-from typing import Tuple
+from typing import Optional, Tuple
 from abc import ABC, abstractmethod
+from pathlib import Path
+import json
+import os
+import threading
 import numpy as np
 
 
@@ -15,8 +19,18 @@ class BaseHitModel(ABC):
     """
     Abstract base class for Hit Models
     Provides interface for easy algorithm swapping
+
+    execution_hint tells the API executor where predictions should run:
+    'inline' (trivial, run on the event loop), 'thread' (releases the GIL,
+    e.g. NumPy/scikit-learn) or 'process' (pure-Python, CPU-bound)
     """
 
+    execution_hint = "thread"
+
+    # Content hash of the tonefield geometry the model was built for
+    # (None: predictions do not depend on geometry)
+    geometry_hash: Optional[str] = None
+
     @abstractmethod
     def predict(self, tonic: float, octave: float, fifth: float) -> Tuple[float, float, float]:
         """
@@ -35,18 +49,70 @@ class BaseHitModel(ABC):
         """
         pass
 
+    def predict_batch(
+        self,
+        tonic: np.ndarray,
+        octave: np.ndarray,
+        fifth: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert arrays of tuning errors to tonefield coordinates and hit strengths
+
+        Default implementation calls predict() once per sample.
+        Subclasses should override it with a vectorized version.
+
+        Args:
+            tonic: Tonic tuning errors (cents), shape (n,)
+            octave: Octave tuning errors (cents), shape (n,)
+            fifth: Fifth tuning errors (cents), shape (n,)
+
+        Returns:
+            Tuple[L, S, strength]: float64 arrays of shape (n,)
+        """
+        tonic, octave, fifth = as_batch_arrays(tonic, octave, fifth)
+        out = np.empty((3, tonic.shape[0]), dtype=np.float64)
+        for i in range(tonic.shape[0]):
+            out[:, i] = self.predict(float(tonic[i]), float(octave[i]), float(fifth[i]))
+        return out[0], out[1], out[2]
+
+    def for_geometry(self, geometry) -> 'BaseHitModel':
+        """
+        Variant of this model for a note's tonefield geometry
+        Geometry-independent models return themselves
+        """
+        return self
+
     @abstractmethod
     def get_model_info(self) -> dict:
         """Return model information"""
         pass
 
 
+def as_batch_arrays(
+    tonic: np.ndarray,
+    octave: np.ndarray,
+    fifth: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert batch inputs to 1-D float64 arrays of equal length"""
+    tonic = np.asarray(tonic, dtype=np.float64).reshape(-1)
+    octave = np.asarray(octave, dtype=np.float64).reshape(-1)
+    fifth = np.asarray(fifth, dtype=np.float64).reshape(-1)
+    if not (tonic.shape == octave.shape == fifth.shape):
+        raise ValueError(
+            f"Batch inputs must have equal length "
+            f"(tonic={tonic.shape[0]}, octave={octave.shape[0]}, fifth={fifth.shape[0]})"
+        )
+    return tonic, octave, fifth
+
+
 class DummyHitModel(BaseHitModel):
     """
     Dummy model: Simple linear transformation for testing
     Placeholder until actual model is developed
     """
 
+    execution_hint = "inline"
+
     def __init__(self):
         self.model_name = "Dummy Linear Model"
         self.version = "0.1.0"
@@ -70,6 +136,22 @@ class DummyHitModel(BaseHitModel):
 
         return L, S, strength
 
+    def predict_batch(
+        self,
+        tonic: np.ndarray,
+        octave: np.ndarray,
+        fifth: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized version of predict()"""
+        tonic, octave, fifth = as_batch_arrays(tonic, octave, fifth)
+        L = tonic * 0.1 + octave * 0.05
+        S = fifth * 0.1 - octave * 0.03
+
+        total_error = np.abs(tonic) + np.abs(octave) + np.abs(fifth)
+        strength = np.minimum(1.0, total_error / 100.0)
+
+        return L, S, strength
+
     def get_model_info(self) -> dict:
         return {
             "name": self.model_name,
@@ -85,57 +167,209 @@ class DummyHitModel(BaseHitModel):
 
 class PhysicsBasedHitModel(BaseHitModel):
     """
-    Physics-based model (future implementation placeholder)
-    Model reflecting physical characteristics of piano strings
+    Physics-based model: modal projection on the elliptical tonefield
+
+    The tonic/octave/fifth mode shapes come from a finite-element
+    eigen-solve of the note's tonefield geometry (models.plate_modes,
+    cached on disk per geometry hash). A hit at point p excites each
+    mode in proportion to |phi(p)|, so the hit point is the mesh node
+    whose modal response best matches the requested correction
+    w = |error| * stiffness_k: score = (phi(p) . w)^2 / |phi(p)|, i.e.
+    projection onto w weighted by how selectively p excites it.
+
+    Modes are symmetric, so only the quadrant x, y >= 0 is searched and
+    the sign of the octave/fifth errors picks the side (as in the
+    tonefield solver). L/S are unit-ellipse coordinates (-1 ~ 1);
+    strength is the error magnitude over the response at the hit point.
     """
 
-    def __init__(self):
+    execution_hint = "inline"
+
+    FULL_SCALE_ERROR = 50.0   # cents giving full strength at a perfect antinode
+    MIN_RESPONSE = 0.05       # response floor for the strength estimate
+
+    def __init__(self, geometry=None, resolution: Optional[int] = None):
+        from config.field_geometry import get_default_geometry
+        from config.physics_config import get_physics_config
+        from models.plate_modes import DEFAULT_MESH_RESOLUTION, load_or_solve
+
         self.model_name = "Physics-Based Model"
-        self.version = "0.0.1"
+        self.version = "1.0.0"
+        self.geometry = geometry or get_default_geometry()
+        self.geometry_hash = self.geometry.content_hash()
+        self.resolution = resolution or DEFAULT_MESH_RESOLUTION
+        self._variants = {self.geometry_hash: self}
+        self._variants_lock = threading.Lock()
+        self.stiffness = np.asarray(get_physics_config().stiffness_k, dtype=np.float64)
+
+        basis = load_or_solve(self.geometry, self.resolution)
+        quadrant = (basis.nodes[:, 0] >= 0) & (basis.nodes[:, 1] >= 0)
+        self.nodes = np.ascontiguousarray(basis.nodes[quadrant])
+        self.response = np.ascontiguousarray(np.abs(basis.shapes[quadrant]))  # (m, 3)
+        self.response_norm = np.linalg.norm(self.response, axis=1)
+        self.frequencies = basis.frequencies
+
+    def for_geometry(self, geometry) -> 'PhysicsBasedHitModel':
+        """Model for another geometry (modes solved or loaded once per geometry hash)"""
+        key = geometry.content_hash()
+        variant = self._variants.get(key)
+        if variant is None:
+            with self._variants_lock:
+                variant = self._variants.get(key)
+                if variant is None:
+                    variant = PhysicsBasedHitModel(geometry, self.resolution)
+                    variant._variants = self._variants
+                    variant._variants_lock = self._variants_lock
+                    self._variants[key] = variant
+        return variant
+
+    def _solve(self, errors: np.ndarray) -> np.ndarray:
+        """errors (n, 3) -> (n, 3) array of (L, S, strength)"""
+        weights = np.abs(errors) * self.stiffness
+        magnitude = np.linalg.norm(weights, axis=1)
+        direction = weights / np.where(magnitude > 0, magnitude, 1.0)[:, None]
+
+        projection = direction @ self.response.T          # (n, m)
+        score = projection ** 2 / np.maximum(self.response_norm, 1e-12)
+        best = np.argmax(score, axis=1)
+        rows = np.arange(len(errors))
+
+        x = self.nodes[best, 0] * np.where(errors[:, 2] < 0, -1.0, 1.0)
+        y = self.nodes[best, 1] * np.where(errors[:, 1] < 0, -1.0, 1.0)
+        response = np.maximum(projection[rows, best], self.MIN_RESPONSE)
+        strength = np.minimum(1.0, magnitude / (self.FULL_SCALE_ERROR * response))
+
+        still = magnitude == 0
+        return np.stack([
+            np.where(still, 0.0, y),
+            np.where(still, 0.0, x),
+            np.where(still, 0.0, strength)
+        ], axis=1)
 
     def predict(self, tonic: float, octave: float, fifth: float) -> Tuple[float, float, float]:
-        raise NotImplementedError("Physics-based model not yet implemented")
+        L, S, strength = self._solve(np.array([[tonic, octave, fifth]], dtype=np.float64))[0]
+        return float(L), float(S), float(strength)
+
+    def predict_batch(
+        self,
+        tonic: np.ndarray,
+        octave: np.ndarray,
+        fifth: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        tonic, octave, fifth = as_batch_arrays(tonic, octave, fifth)
+        errors = np.stack([tonic, octave, fifth], axis=1)
+        out = np.empty_like(errors)
+        for start in range(0, len(errors), 4096):  # bounds the (n, m) score matrix
+            out[start:start + 4096] = self._solve(errors[start:start + 4096])
+        return out[:, 0], out[:, 1], out[:, 2]
 
     def get_model_info(self) -> dict:
         return {
             "name": self.model_name,
             "version": self.version,
-            "description": "Physics-based model (not yet implemented)",
-            "status": "placeholder"
+            "description": (
+                f"Finite-element modal projection on the elliptical tonefield "
+                f"({self.resolution} cells across the long axis)"
+            ),
+            "geometry_hash": self.geometry_hash,
+            "frequency_ratios": dict(zip(("tonic", "octave", "fifth"), self.frequencies.tolist()))
         }
 
 
+ML_ARTIFACT_ENV_VAR = "TUNING_LAB_ML_ARTIFACT"
+DEFAULT_ML_ARTIFACT = Path(__file__).parent.parent / "data" / "models" / "ml_hit_model.npy"
+
+
 class MLBasedHitModel(BaseHitModel):
     """
-    ML-based model (future implementation placeholder)
-    Model trained from experimental data
+    ML-based model trained from experimental data
+
+    Runs a small multi-layer perceptron exported by models.ml_training
+    as plain NumPy arrays: one flat float64 .npy (memory-mapped) plus a
+    .json sidecar with the array layout and training report, so
+    inference needs neither scikit-learn nor unpickling.
     """
 
-    def __init__(self):
+    execution_hint = "inline"
+
+    def __init__(self, path: Optional[Path] = None):
         self.model_name = "ML-Based Model"
-        self.version = "0.0.1"
+        self.path = Path(path or os.environ.get(ML_ARTIFACT_ENV_VAR, DEFAULT_ML_ARTIFACT))
+        if not self.path.exists():
+            raise FileNotFoundError(
+                f"ML model artifact not found at {self.path} "
+                f"(train one with: python -m models.ml_training)"
+            )
+
+        self.metadata = json.loads(self.path.with_suffix('.json').read_text(encoding='utf-8'))
+        flat = np.load(self.path, mmap_mode='r')
+
+        def array(name: str) -> np.ndarray:
+            offset, shape = self.metadata['arrays'][name]
+            return np.asarray(flat[offset:offset + int(np.prod(shape))]).reshape(shape)
+
+        self.x_mean, self.x_scale = array('x_mean'), array('x_scale')
+        self.y_mean, self.y_scale = array('y_mean'), array('y_scale')
+        self.layers = [
+            (array(f'W{i}'), array(f'b{i}')) for i in range(self.metadata['n_layers'])
+        ]
+        self.activation = self.metadata['activation']
+        self.version = f"1.0.0+{self.metadata['artifact_id']}"
+
+    def _forward(self, x: np.ndarray) -> np.ndarray:
+        h = (x - self.x_mean) / self.x_scale
+        for i, (W, b) in enumerate(self.layers):
+            h = h @ W + b
+            if i < len(self.layers) - 1:
+                h = np.maximum(h, 0.0) if self.activation == 'relu' else np.tanh(h)
+        y = h * self.y_scale + self.y_mean
+        y[..., 2] = np.clip(y[..., 2], 0.0, 1.0)
+        return y
 
     def predict(self, tonic: float, octave: float, fifth: float) -> Tuple[float, float, float]:
-        raise NotImplementedError("ML-based model not yet implemented")
+        L, S, strength = self._forward(np.array([tonic, octave, fifth], dtype=np.float64))
+        return float(L), float(S), float(strength)
+
+    def predict_batch(
+        self,
+        tonic: np.ndarray,
+        octave: np.ndarray,
+        fifth: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        tonic, octave, fifth = as_batch_arrays(tonic, octave, fifth)
+        y = self._forward(np.stack([tonic, octave, fifth], axis=1))
+        return y[:, 0], y[:, 1], y[:, 2]
 
     def get_model_info(self) -> dict:
         return {
             "name": self.model_name,
             "version": self.version,
-            "description": "Machine learning based model (not yet implemented)",
-            "status": "placeholder"
+            "description": (
+                f"MLP regressor {self.metadata['hidden_layer_sizes']} trained on "
+                f"{self.metadata['training_size']} samples ({self.metadata['source']})"
+            ),
+            "training_size": self.metadata['training_size'],
+            "validation_size": self.metadata['validation_size'],
+            "validation_rmse": self.metadata['validation_rmse'],
+            "trained_at": self.metadata['trained_at']
         }
 
 
 def get_active_model() -> BaseHitModel:
     """
     Return current active model
-    Can be extended to select from config or environment variable
+    Shared process-wide instance selected through models.registry
+    (TUNING_LAB_MODEL env var, default: 'dummy')
     """
-    return DummyHitModel()
+    from models.registry import get_model_registry
+    return get_model_registry().get_active()
 
 
 if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
     model = get_active_model()
     print(f"Active Model: {model.get_model_info()['name']}")
 
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Impact Power: Hit force, hit count and hammering type calculation
+
+Vectorized port of calculateImpactPower (tuning-console/lib/TuningPhysicsConfig.ts).
+The split count is solved in closed form as the smallest n with
+THRESHOLD_C + E / sqrt(n) <= LIMIT instead of iterating per point.
+"""
+
+from typing import NamedTuple, Optional, Tuple
+import numpy as np
+
+from config.physics_config import PhysicsConfig, get_physics_config
+from models.tonefield_solver import FIFTH, TonefieldSolution, solve
+
+
+# Hammering type codes (index into HAMMERING_TYPE_NAMES)
+SNAP, PULL, PRESS = 0, 1, 2
+HAMMERING_TYPE_NAMES = ("SNAP", "PULL", "PRESS")
+
+MAX_HIT_COUNT = 10       # console safeguard: never split beyond 10 hits
+MIN_EFFICIENCY = 0.1     # relative efficiency floor (10%)
+
+
+class ImpactPower(NamedTuple):
+    """Columnar impact result (all arrays have shape (n,))"""
+    force: np.ndarray           # per-hit force (machine level, 0.1 resolution)
+    count: np.ndarray           # number of hits
+    hammering_type: np.ndarray  # hammering type code (SNAP/PULL/PRESS)
+    coverage: np.ndarray        # fraction of the error the hits correct (< 1 when capped)
+
+
+def split_hit_count(pure_energy: np.ndarray, config: PhysicsConfig) -> np.ndarray:
+    """
+    Smallest n >= 1 with threshold_c + pure_energy / sqrt(n) <= limit
+
+    Closed form n = ceil((E / (LIMIT - C))^2), followed by a one-step
+    correction so float rounding agrees with the direct inequality.
+    """
+    headroom = config.limit - config.threshold_c
+    count = np.ceil((pure_energy / headroom) ** 2)
+    count = np.clip(count, 1, MAX_HIT_COUNT + 1)
+
+    exceeds = config.threshold_c + pure_energy / np.sqrt(count) > config.limit
+    count = count + exceeds
+    fits_lower = (count > 1) & (
+        config.threshold_c + pure_energy / np.sqrt(np.maximum(count - 1, 1)) <= config.limit
+    )
+    count = count - fits_lower
+    return count.astype(np.int64)
+
+
+def hammering_types(raw_hz: np.ndarray, config: Optional[PhysicsConfig] = None) -> np.ndarray:
+    """Hammering type codes from the signed primary error"""
+    rules = (config or get_physics_config()).hammering
+    raw_hz = np.asarray(raw_hz, dtype=np.float64)
+    abs_hz = np.abs(raw_hz)
+
+    internal = np.where(
+        abs_hz <= rules.internal_snap_limit, SNAP,
+        np.where(abs_hz < rules.internal_press_start, PULL, PRESS)
+    )
+    external = np.where(abs_hz <= rules.external_snap_limit, SNAP, PRESS)
+    return np.where(raw_hz < 0, internal, external)
+
+
+def pure_energy(
+    raw_hz: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    mode: np.ndarray,
+    config: PhysicsConfig
+) -> np.ndarray:
+    """Deformation energy above THRESHOLD_C needed to correct the error in one hit"""
+    raw_hz = np.asarray(raw_hz, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    mode = np.asarray(mode, dtype=np.int64)
+
+    # 1. Relative efficiency against the vibrating axis vertex
+    is_fifth = mode == FIFTH
+    position = np.where(is_fifth, np.abs(x), np.abs(y))
+    vertex = np.where(is_fifth, config.tonefield_radius_x, config.tonefield_radius_y)
+    efficiency = np.maximum(position / vertex, MIN_EFFICIENCY)
+    effective_hz = np.abs(raw_hz) / efficiency
+
+    # 2. Single-hit energy: C + sqrt(effective_hz * S * K)
+    stiffness = np.asarray(config.stiffness_k, dtype=np.float64)[mode]
+    return np.sqrt(effective_hz * config.scaling_s * stiffness)
+
+
+def calculate_impact_power(
+    raw_hz: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    mode: np.ndarray,
+    config: Optional[PhysicsConfig] = None
+) -> ImpactPower:
+    """
+    Compute optimal force, hit count and hammering type
+
+    Args:
+        raw_hz: Signed error of the primary target
+        x: Short axis (fifth) coordinate
+        y: Long axis (tonic/octave) coordinate
+        mode: Primary target code (TONIC/OCTAVE/FIFTH)
+        config: Physics constants (default: active PhysicsConfig)
+
+    Returns:
+        ImpactPower with columnar results
+    """
+    config = config or get_physics_config()
+    raw_hz = np.asarray(raw_hz, dtype=np.float64)
+    # 1-2. Efficiency-adjusted single-hit energy
+    energy = pure_energy(raw_hz, x, y, mode, config)
+
+    # 3. Split into several hits when the force exceeds the machine limit
+    count = split_hit_count(energy, config)
+    capped = count > MAX_HIT_COUNT
+    force = np.where(
+        capped,
+        config.limit,
+        config.threshold_c + energy / np.sqrt(np.minimum(count, MAX_HIT_COUNT))
+    )
+    count = np.minimum(count, MAX_HIT_COUNT)
+
+    # Capped hits deliver (LIMIT - C) * sqrt(MAX_HIT_COUNT) of the needed
+    # energy; energy grows with sqrt(Hz), so the corrected share is its square
+    delivered = (config.limit - config.threshold_c) * np.sqrt(MAX_HIT_COUNT)
+    coverage = np.where(
+        capped, (delivered / np.maximum(energy, 1e-12)) ** 2, 1.0
+    )
+
+    return ImpactPower(
+        force=np.round(force, 1),
+        count=count,
+        hammering_type=hammering_types(raw_hz, config),
+        coverage=np.minimum(coverage, 1.0)
+    )
+
+
+def solve_impact(
+    tonic: np.ndarray,
+    octave: np.ndarray,
+    fifth: np.ndarray,
+    config: Optional[PhysicsConfig] = None
+) -> Tuple[TonefieldSolution, ImpactPower]:
+    """Run the coordinate solver and impact calculation together"""
+    solution = solve(tonic, octave, fifth)
+    impact = calculate_impact_power(
+        solution.primary_error, solution.x, solution.y, solution.primary, config
+    )
+    return solution, impact
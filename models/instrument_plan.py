@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Instrument Plan: Score every note of an instrument in one pass
+
+Takes the measured errors of all notes (8-20 on a handpan), runs the
+active hit model, the tonefield solver and the impact calculation over
+the whole instrument as arrays, and orders the notes into a hammering
+plan by expected error reduction.
+
+Expected reduction of a note = coverage * (|primary error| +
+AUXILIARY_WEIGHT * |cooperative auxiliary error|), where coverage is the
+share of the error the planned hits correct (below 1 only when the hit
+count is capped, see models.impact_power).
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import numpy as np
+
+from config.field_geometry import TonefieldGeometry, get_geometry_config
+from config.physics_config import PhysicsConfig
+from models.hit_model import BaseHitModel, get_active_model
+from models.impact_power import HAMMERING_TYPE_NAMES, solve_impact
+from models.tonefield_solver import AUXILIARY_WEIGHT, NO_TARGET, hit_point_columns
+
+
+DEFAULT_TOLERANCE = 0.5  # notes with every |error| at or below this are in tune
+
+
+class NoteErrors(NamedTuple):
+    """Measured errors of one note"""
+    note: str
+    tonic: float
+    octave: float
+    fifth: float
+    geometry: Optional[TonefieldGeometry] = None  # None: geometry registry / model default
+
+
+class InstrumentPlan(NamedTuple):
+    """Hammering plan for a whole instrument"""
+    steps: List[Dict]         # notes needing work, highest expected reduction first
+    in_tune: List[str]        # notes within tolerance
+    model_name: str
+    total_hits: int
+    total_expected_reduction: float
+
+
+def _resolve_geometry(entry: NoteErrors) -> Optional[TonefieldGeometry]:
+    if entry.geometry is not None:
+        return entry.geometry
+    config = get_geometry_config()
+    return config.get_geometry(entry.note) if config.has_geometry(entry.note) else None
+
+
+def predict_notes(model: BaseHitModel, errors: np.ndarray,
+                  geometries: Sequence[Optional[TonefieldGeometry]]) -> np.ndarray:
+    """
+    (n, 3) array of model (L, S, strength) for notes with per-note geometry
+
+    Notes are grouped by the model variant their geometry resolves to,
+    so geometry-independent models answer in a single predict_batch.
+    """
+    variants: Dict[Optional[str], BaseHitModel] = {}
+    groups: Dict[int, List[int]] = {}
+    targets: Dict[int, BaseHitModel] = {}
+    for i, geometry in enumerate(geometries):
+        key = geometry.content_hash() if geometry is not None else None
+        if key not in variants:
+            variants[key] = model.for_geometry(geometry) if geometry is not None else model
+        target = variants[key]
+        groups.setdefault(id(target), []).append(i)
+        targets[id(target)] = target
+
+    out = np.empty((len(errors), 3), dtype=np.float64)
+    for target_id, indices in groups.items():
+        idx = np.asarray(indices)
+        out[idx] = np.column_stack(
+            targets[target_id].predict_batch(errors[idx, 0], errors[idx, 1], errors[idx, 2])
+        )
+    return out
+
+
+def plan_instrument(
+    notes: Sequence[NoteErrors],
+    model: Optional[BaseHitModel] = None,
+    config: Optional[PhysicsConfig] = None,
+    tolerance: float = DEFAULT_TOLERANCE
+) -> InstrumentPlan:
+    """
+    Compute hit points, impact and a prioritized plan for every note
+
+    Args:
+        notes: Errors (and optional geometry) per note
+        model: Hit model (default: active model)
+        config: Physics constants (default: active PhysicsConfig)
+        tolerance: Notes with every |error| <= tolerance are left out of the plan
+
+    Returns:
+        InstrumentPlan
+    """
+    model = model or get_active_model()
+    names = [entry.note for entry in notes]
+    errors = np.array([[e.tonic, e.octave, e.fifth] for e in notes], dtype=np.float64).reshape(-1, 3)
+
+    predictions = predict_notes(model, errors, [_resolve_geometry(e) for e in notes])
+    solution, impact = solve_impact(errors[:, 0], errors[:, 1], errors[:, 2], config)
+    columns = hit_point_columns(solution)
+
+    rows = np.arange(len(errors))
+    aux_error = np.where(
+        solution.auxiliary != NO_TARGET,
+        np.abs(errors[rows, np.maximum(solution.auxiliary, 0)]),
+        0.0
+    )
+    expected = impact.coverage * (np.abs(solution.primary_error) + AUXILIARY_WEIGHT * aux_error)
+    in_tune = np.all(np.abs(errors) <= tolerance, axis=1)
+
+    # Highest expected reduction first; fewer hits break ties
+    order = np.lexsort((impact.count, -expected))
+    steps = []
+    for i in order[~in_tune[order]]:
+        steps.append({
+            "priority": len(steps) + 1,
+            "note": names[i],
+            "tonic": float(errors[i, 0]),
+            "octave": float(errors[i, 1]),
+            "fifth": float(errors[i, 2]),
+            "L": float(predictions[i, 0]),
+            "S": float(predictions[i, 1]),
+            "strength": float(predictions[i, 2]),
+            "coordinate_x": float(solution.x[i]),
+            "coordinate_y": float(solution.y[i]),
+            "primary_target": columns["primary_target"][i],
+            "auxiliary_target": columns["auxiliary_target"][i],
+            "target_display": columns["target_display"][i],
+            "location": columns["location"][i],
+            "intent": columns["intent"][i],
+            "force": float(impact.force[i]),
+            "hit_count": int(impact.count[i]),
+            "hammering_type": HAMMERING_TYPE_NAMES[impact.hammering_type[i]],
+            "coverage": float(impact.coverage[i]),
+            "expected_reduction": float(expected[i]),
+        })
+
+    return InstrumentPlan(
+        steps=steps,
+        in_tune=[names[i] for i in np.nonzero(in_tune)[0]],
+        model_name=model.get_model_info()['name'],
+        total_hits=int(sum(step["hit_count"] for step in steps)),
+        total_expected_reduction=float(sum(step["expected_reduction"] for step in steps)),
+    )
+
+
+if __name__ == "__main__":
+    # Usage: python -m models.instrument_plan
+    demo = [
+        NoteErrors("D3", 3.0, -1.0, 0.5),
+        NoteErrors("A3", -12.0, -4.0, 2.0),
+        NoteErrors("Bb3", 0.2, 0.1, -0.3),
+        NoteErrors("C4", 1.5, 6.0, -2.5),
+        NoteErrors("D4", 25.0, 3.0, 8.0),
+    ]
+    plan = plan_instrument(demo)
+    print(f"Model: {plan.model_name}, {plan.total_hits} hits, in tune: {plan.in_tune}")
+    for step in plan.steps:
+        print(f"{step['priority']}. {step['note']}: {step['target_display']} "
+              f"{step['hammering_type']} x{step['hit_count']} @ {step['force']} "
+              f"(-{step['expected_reduction']:.2f})")
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+ML Training: Fit MLBasedHitModel from experiment data
+
+Reads (tonic, octave, fifth) -> (L, S, strength) samples from the
+experiment store, fits a scikit-learn MLPRegressor on standardized
+inputs/outputs and exports its weights as a flat NumPy artifact that
+MLBasedHitModel loads without scikit-learn.
+
+Usage:
+    python -m models.ml_training
+    python -m models.ml_training --teacher tonefield --synthetic 50000
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+from pathlib import Path
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+
+from models.hit_model import DEFAULT_ML_ARTIFACT, ML_ARTIFACT_ENV_VAR, BaseHitModel
+
+
+DEFAULT_HIDDEN_LAYERS = (64, 64)
+VALIDATION_FRACTION = 0.2
+MIN_TRAINING_SAMPLES = 50
+OUTPUT_NAMES = ("L", "S", "strength")
+
+
+def load_experiment_data(notes: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """(X, y) arrays of shape (n, 3) from experiment store rows with outputs"""
+    from storage.experiment_store import get_experiment_store
+
+    table = get_experiment_store().scan(
+        columns=["tonic", "octave", "fifth", "L", "S", "strength"], notes=notes
+    )
+    data = np.column_stack([
+        table[name].to_numpy(zero_copy_only=False).astype(np.float64) for name in table.column_names
+    ]) if table.num_rows else np.empty((0, 6))
+    data = data[np.isfinite(data).all(axis=1)]
+    return data[:, :3], data[:, 3:]
+
+
+def synthesize_data(teacher: BaseHitModel, samples: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """(X, y) labelled by an existing model over the input domain (-50 ~ +50 cents)"""
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(-50.0, 50.0, size=(samples, 3))
+    y = np.column_stack(teacher.predict_batch(X[:, 0], X[:, 1], X[:, 2]))
+    return X, y
+
+
+def train(
+    X: np.ndarray,
+    y: np.ndarray,
+    hidden_layer_sizes: Sequence[int] = DEFAULT_HIDDEN_LAYERS,
+    seed: int = 0,
+) -> Tuple[Dict[str, np.ndarray], dict]:
+    """
+    Fit the regressor and return (arrays, report)
+
+    arrays holds the standardization vectors and layer weights
+    (x_mean, x_scale, y_mean, y_scale, W0, b0, ...); report holds the
+    training/validation sizes and per-output validation RMSE.
+    """
+    from sklearn.model_selection import train_test_split
+    from sklearn.neural_network import MLPRegressor
+
+    if len(X) < MIN_TRAINING_SAMPLES:
+        raise ValueError(
+            f"Need at least {MIN_TRAINING_SAMPLES} samples with outputs, got {len(X)} "
+            f"(record experiments or use --teacher)"
+        )
+
+    X_train, X_val, y_train, y_val = train_test_split(
+        X, y, test_size=VALIDATION_FRACTION, random_state=seed
+    )
+    x_mean, x_scale = X_train.mean(axis=0), X_train.std(axis=0)
+    y_mean, y_scale = y_train.mean(axis=0), y_train.std(axis=0)
+    x_scale[x_scale == 0] = 1.0
+    y_scale[y_scale == 0] = 1.0
+
+    regressor = MLPRegressor(
+        hidden_layer_sizes=tuple(hidden_layer_sizes),
+        activation="relu",
+        early_stopping=True,
+        max_iter=500,
+        random_state=seed,
+    )
+    regressor.fit((X_train - x_mean) / x_scale, (y_train - y_mean) / y_scale)
+
+    y_pred = regressor.predict((X_val - x_mean) / x_scale) * y_scale + y_mean
+    y_pred[:, 2] = np.clip(y_pred[:, 2], 0.0, 1.0)
+    rmse = np.sqrt(np.mean((y_pred - y_val) ** 2, axis=0))
+
+    arrays = {"x_mean": x_mean, "x_scale": x_scale, "y_mean": y_mean, "y_scale": y_scale}
+    for i, (W, b) in enumerate(zip(regressor.coefs_, regressor.intercepts_)):
+        arrays[f"W{i}"] = W
+        arrays[f"b{i}"] = b
+
+    report = {
+        "hidden_layer_sizes": list(hidden_layer_sizes),
+        "activation": "relu",
+        "n_layers": len(regressor.coefs_),
+        "training_size": int(len(X_train)),
+        "validation_size": int(len(X_val)),
+        "validation_rmse": {name: float(v) for name, v in zip(OUTPUT_NAMES, rmse)},
+        "iterations": int(regressor.n_iter_),
+    }
+    return arrays, report
+
+
+def export_artifact(arrays: Dict[str, np.ndarray], report: dict, path: Path, source: str) -> Path:
+    """Write the flat weight vector (.npy) and its layout/report (.json)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    layout, chunks, offset = {}, [], 0
+    for name, value in arrays.items():
+        value = np.ascontiguousarray(value, dtype=np.float64)
+        layout[name] = [offset, list(value.shape)]
+        chunks.append(value.ravel())
+        offset += value.size
+    flat = np.concatenate(chunks)
+
+    meta = dict(
+        report,
+        arrays=layout,
+        source=source,
+        trained_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        artifact_id=hashlib.sha256(flat.tobytes()).hexdigest()[:12],
+    )
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.npy.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        np.save(f, flat)
+    os.replace(tmp_name, path)
+    path.with_suffix('.json').write_text(json.dumps(meta, indent=2), encoding='utf-8')
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+    from models.registry import get_model_registry
+
+    parser = argparse.ArgumentParser(description="Train the ML hit model")
+    parser.add_argument("--notes", nargs="+", help="Only use experiments for these notes")
+    parser.add_argument("--teacher", help="Registered model used to synthesize extra labelled samples")
+    parser.add_argument("--synthetic", type=int, default=20000, help="Synthetic samples (with --teacher)")
+    parser.add_argument("--hidden", type=int, nargs="+", default=list(DEFAULT_HIDDEN_LAYERS))
+    parser.add_argument("--output", type=Path,
+                        default=Path(os.environ.get(ML_ARTIFACT_ENV_VAR, DEFAULT_ML_ARTIFACT)))
+    args = parser.parse_args()
+
+    X, y = load_experiment_data(args.notes)
+    source = f"experiment store: {len(X)} rows"
+    if args.teacher:
+        X_syn, y_syn = synthesize_data(get_model_registry().get(args.teacher), args.synthetic)
+        X, y = np.concatenate([X, X_syn]), np.concatenate([y, y_syn])
+        source += f" + {args.synthetic} synthetic from {args.teacher}"
+
+    arrays, report = train(X, y, args.hidden)
+    export_artifact(arrays, report, args.output, source)
+    print(f"Trained on {report['training_size']} samples ({source})")
+    for name, value in report['validation_rmse'].items():
+        print(f"Validation RMSE ({name}): {value:.6f}")
+    print(f"Artifact written to {args.output}")
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Plate Modes: Finite-element modal analysis of the elliptical tonefield
+
+The tonefield is modelled as a clamped elliptical membrane (tension
+dominated, as after hammering) discretized with linear triangles on a
+uniform grid. Sparse stiffness K and lumped mass M are assembled with
+SciPy and the lowest modes come from scipy.sparse.linalg.eigsh
+(shift-invert around 0).
+
+Modes are classified by symmetry in the ellipse frame
+(x = short axis, y = long axis):
+    tonic:  even in x, even in y (single central antinode)
+    octave: even in x, odd in y  (nodal line across the long axis)
+    fifth:  odd in x,  even in y (nodal line along the long axis)
+
+Solutions are cached on disk per geometry hash, so the eigen-solve only
+runs once per geometry.
+"""
+
+from typing import NamedTuple, Optional, Tuple
+from pathlib import Path
+import json
+import os
+import tempfile
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import eigsh
+
+from config.field_geometry import TonefieldGeometry
+
+
+MODE_DIR_ENV_VAR = "TUNING_LAB_MODE_DIR"
+DEFAULT_MODE_DIR = Path(__file__).parent.parent / "data" / "modes"
+DEFAULT_MESH_RESOLUTION = 64    # grid cells across the long axis
+SOLVER_VERSION = "1"            # bump when the discretization changes
+N_EIGEN = 10                    # modes computed before classification
+
+MODE_NAMES = ("tonic", "octave", "fifth")
+_PARITIES = ((1, 1), (1, -1), (-1, 1))  # (x, y) parity per MODE_NAMES entry
+
+
+class ModalBasis(NamedTuple):
+    """Tonic/octave/fifth mode shapes sampled at the free mesh nodes"""
+    nodes: np.ndarray        # (m, 2) unit-ellipse coordinates (x/semi_minor, y/semi_major)
+    shapes: np.ndarray       # (m, 3) mode shapes, each scaled to max |value| = 1
+    frequencies: np.ndarray  # (3,) natural frequencies relative to the tonic
+
+
+def build_mesh(semi_x: float, semi_y: float, resolution: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Structured triangle mesh of the ellipse (x/semi_x)^2 + (y/semi_y)^2 <= 1
+
+    Cells whose four corners lie inside are split into two triangles;
+    nodes not surrounded by mesh cells are clamped.
+
+    Returns:
+        (nodes (n, 2), integer grid coordinates (n, 2), triangles (t, 3), free-node mask (n,))
+    """
+    h = 2.0 * max(semi_x, semi_y) / resolution
+    nx, ny = int(np.ceil(semi_x / h)), int(np.ceil(semi_y / h))
+    gi, gj = np.meshgrid(np.arange(-nx, nx + 1), np.arange(-ny, ny + 1), indexing='ij')
+    inside = (gi * h / semi_x) ** 2 + (gj * h / semi_y) ** 2 <= 1.0
+
+    # Cell (i, j) spans grid points (i..i+1, j..j+1)
+    cells = inside[:-1, :-1] & inside[1:, :-1] & inside[:-1, 1:] & inside[1:, 1:]
+    used = np.zeros_like(inside)
+    used[:-1, :-1] |= cells
+    used[1:, :-1] |= cells
+    used[:-1, 1:] |= cells
+    used[1:, 1:] |= cells
+
+    padded = np.pad(cells, 1)
+    surrounded = padded[:-1, :-1] & padded[1:, :-1] & padded[:-1, 1:] & padded[1:, 1:]
+
+    index = np.full(inside.shape, -1)
+    index[used] = np.arange(used.sum())
+    ci, cj = np.nonzero(cells)
+    a, b = index[ci, cj], index[ci + 1, cj]
+    c, d = index[ci, cj + 1], index[ci + 1, cj + 1]
+    triangles = np.concatenate([np.stack([a, b, d], axis=1), np.stack([a, d, c], axis=1)])
+
+    grid = np.stack([gi[used], gj[used]], axis=1)
+    return grid * h, grid, triangles, surrounded[used]
+
+
+def assemble(nodes: np.ndarray, triangles: np.ndarray) -> Tuple[sp.csr_matrix, sp.csr_matrix]:
+    """Sparse P1 stiffness matrix and lumped (diagonal) mass matrix"""
+    p = nodes[triangles]                       # (t, 3, 2)
+    e1, e2 = p[:, 1] - p[:, 0], p[:, 2] - p[:, 0]
+    area = 0.5 * np.abs(e1[:, 0] * e2[:, 1] - e1[:, 1] * e2[:, 0])
+
+    # Gradients of the barycentric basis functions: rotated opposite edges / (2 * area)
+    edges = np.stack([p[:, 2] - p[:, 1], p[:, 0] - p[:, 2], p[:, 1] - p[:, 0]], axis=1)
+    grads = np.stack([-edges[..., 1], edges[..., 0]], axis=-1) / (2.0 * area[:, None, None])
+    local = area[:, None, None] * np.einsum('tik,tjk->tij', grads, grads)
+
+    rows = np.repeat(triangles, 3, axis=1).ravel()
+    cols = np.tile(triangles, (1, 3)).ravel()
+    n = len(nodes)
+    K = sp.coo_matrix((local.ravel(), (rows, cols)), shape=(n, n)).tocsr()
+    lumped = np.bincount(triangles.ravel(), weights=np.repeat(area / 3.0, 3), minlength=n)
+    return K, sp.diags(lumped).tocsr()
+
+
+def _reflection(grid: np.ndarray, axis: int) -> np.ndarray:
+    """Permutation mapping each node to its mirror image across one axis"""
+    lookup = {(int(i), int(j)): k for k, (i, j) in enumerate(grid)}
+    mirrored = grid.copy()
+    mirrored[:, axis] *= -1
+    return np.array([lookup[(int(i), int(j))] for i, j in mirrored])
+
+
+def solve_modes(geometry: TonefieldGeometry, resolution: int = DEFAULT_MESH_RESOLUTION) -> ModalBasis:
+    """Run the eigen-solve for one geometry (uncached)"""
+    semi_x = geometry.ellipse.semi_minor * geometry.scale_factor
+    semi_y = geometry.ellipse.semi_major * geometry.scale_factor
+    nodes, grid, triangles, free = build_mesh(semi_x, semi_y, resolution)
+    K, M = assemble(nodes, triangles)
+
+    K_ff = K[free][:, free]
+    M_ff = M[free][:, free]
+    eigenvalues, vectors = eigsh(K_ff, k=N_EIGEN, M=M_ff, sigma=0, which='LM')
+    order = np.argsort(eigenvalues)
+    eigenvalues, vectors = eigenvalues[order], vectors[:, order]
+
+    free_grid = grid[free]
+    flip_x, flip_y = _reflection(free_grid, 0), _reflection(free_grid, 1)
+
+    # Project each mode onto the symmetry class and keep the lowest mode
+    # with a significant component (robust to degenerate pairs on circles)
+    shapes, frequencies = [], []
+    for parity_x, parity_y in _PARITIES:
+        for k in range(N_EIGEN):
+            v = vectors[:, k]
+            v = 0.5 * (v + parity_x * v[flip_x])
+            v = 0.5 * (v + parity_y * v[flip_y])
+            if np.linalg.norm(v) > 0.5 * np.linalg.norm(vectors[:, k]):
+                shapes.append(v / np.max(np.abs(v)))
+                frequencies.append(np.sqrt(eigenvalues[k]))
+                break
+        else:
+            raise ValueError(f"No mode with parity ({parity_x}, {parity_y}) among the lowest {N_EIGEN}")
+
+    frequencies = np.array(frequencies)
+    return ModalBasis(
+        nodes=nodes[free] / np.array([semi_x, semi_y]),
+        shapes=np.stack(shapes, axis=1),
+        frequencies=frequencies / frequencies[0],
+    )
+
+
+def load_or_solve(
+    geometry: TonefieldGeometry,
+    resolution: int = DEFAULT_MESH_RESOLUTION,
+    cache_dir: Optional[Path] = None
+) -> ModalBasis:
+    """Return the cached modal basis for a geometry, solving and saving it on first use"""
+    cache_dir = Path(cache_dir or os.environ.get(MODE_DIR_ENV_VAR, DEFAULT_MODE_DIR))
+    key = f"{geometry.content_hash()[:16]}-r{resolution}-v{SOLVER_VERSION}"
+    path = cache_dir / f"{key}.npz"
+
+    if path.exists():
+        with np.load(path) as data:
+            return ModalBasis(data['nodes'], data['shapes'], data['frequencies'])
+
+    basis = solve_modes(geometry, resolution)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix='.npz.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        np.savez(f, **basis._asdict())
+    os.replace(tmp_name, path)
+    path.with_suffix('.json').write_text(json.dumps({
+        'geometry': geometry.to_dict(),
+        'resolution': resolution,
+        'solver_version': SOLVER_VERSION,
+        'frequencies': dict(zip(MODE_NAMES, basis.frequencies.tolist())),
+    }, indent=2), encoding='utf-8')
+    return basis
+
+
+if __name__ == "__main__":
+    # Usage: python -m models.plate_modes [resolution]
+    import sys
+    import time
+    from config.field_geometry import get_default_geometry
+
+    resolution = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MESH_RESOLUTION
+    start = time.perf_counter()
+    basis = solve_modes(get_default_geometry(), resolution)
+    print(f"Solved {len(basis.nodes)} free nodes in {time.perf_counter() - start:.3f}s")
+    for name, ratio in zip(MODE_NAMES, basis.frequencies):
+        print(f"{name}: {ratio:.4f} x tonic")
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Prediction Cache: Bounded LRU/TTL cache in front of the active hit model
+
+Keys are inputs quantized to a fixed resolution (default 0.1 cent) plus
+model name/version and geometry hash. The model is evaluated on the
+quantized inputs, so every request that falls into the same cell gets
+the same answer.
+Entries are dropped automatically when the active model or the
+GeometryConfig changes.
+"""
+
+from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+import os
+import threading
+import time
+
+from models.hit_model import BaseHitModel, get_active_model
+from config.field_geometry import TonefieldGeometry, get_geometry_config
+
+
+CACHE_SIZE_ENV_VAR = "TUNING_LAB_CACHE_SIZE"
+CACHE_TTL_ENV_VAR = "TUNING_LAB_CACHE_TTL"
+CACHE_RESOLUTION_ENV_VAR = "TUNING_LAB_CACHE_RESOLUTION"
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_RESOLUTION = 0.1  # cents
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of (L, S, strength) predictions
+
+    Args:
+        maxsize: Maximum number of entries (LRU eviction beyond it)
+        ttl: Entry lifetime in seconds (None: no expiry)
+        resolution: Input quantization step (cents)
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: Optional[float] = None,
+                 resolution: float = DEFAULT_RESOLUTION):
+        if maxsize <= 0 or resolution <= 0:
+            raise ValueError("maxsize and resolution must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.resolution = resolution
+
+        self._entries: "OrderedDict[tuple, Tuple[Tuple[float, float, float], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._token: Optional[tuple] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_token(self, model: BaseHitModel):
+        """Clear all entries when the model instance or geometry config changed (lock held)"""
+        token = (id(model), get_geometry_config().version)
+        if token != self._token:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self._token = token
+
+    def predict(self, model: BaseHitModel, tonic: float, octave: float, fifth: float,
+                model_info: Optional[dict] = None,
+                geometry: Optional[TonefieldGeometry] = None) -> Tuple[float, float, float]:
+        """
+        Return a cached prediction, computing it on the quantized inputs on a miss
+
+        With a geometry, the model's variant for that geometry answers
+        (see BaseHitModel.for_geometry).
+        """
+        info = model_info or model.get_model_info()
+        target = model.for_geometry(geometry) if geometry is not None else model
+        res = self.resolution
+        qt, qo, qf = round(tonic / res), round(octave / res), round(fifth / res)
+        key = (info['name'], info['version'], target.geometry_hash, qt, qo, qf)
+        now = time.monotonic()
+
+        with self._lock:
+            self._check_token(model)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] >= now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        value = target.predict(qt * res, qo * res, qf * res)
+        expires_at = now + self.ttl if self.ttl is not None else float('inf')
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "resolution": self.resolution,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+
+
+def _cache_from_env() -> PredictionCache:
+    ttl = os.environ.get(CACHE_TTL_ENV_VAR)
+    return PredictionCache(
+        maxsize=int(os.environ.get(CACHE_SIZE_ENV_VAR, DEFAULT_MAXSIZE)),
+        ttl=float(ttl) if ttl else None,
+        resolution=float(os.environ.get(CACHE_RESOLUTION_ENV_VAR, DEFAULT_RESOLUTION))
+    )
+
+
+_cache = _cache_from_env()
+
+
+def get_prediction_cache() -> PredictionCache:
+    return _cache
+
+
+def cached_predict(tonic: float, octave: float, fifth: float,
+                   geometry: Optional[TonefieldGeometry] = None) -> Tuple[BaseHitModel, Tuple[float, float, float]]:
+    """
+    Predict with the active model through the shared cache
+
+    Args:
+        geometry: Tonefield geometry of the note (None: model default)
+
+    Returns:
+        Tuple[model, (L, S, strength)]
+    """
+    model = get_active_model()
+    return model, _cache.predict(model, tonic, octave, fifth, geometry=geometry)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Model Registry: Process-wide hit model selection and instance sharing
+
+Models are selected by name (TUNING_LAB_MODEL env var or set_active()),
+built once, and shared by every thread / event loop in the process.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+from pathlib import Path
+import os
+import threading
+
+from models.hit_model import (
+    BaseHitModel,
+    DummyHitModel,
+    PhysicsBasedHitModel,
+    MLBasedHitModel,
+)
+from models.tonefield_solver import TonefieldSolverModel
+from models.tabulated import DEFAULT_RESOLUTION, TabulatedHitModel
+
+
+MODEL_ENV_VAR = "TUNING_LAB_MODEL"
+DEFAULT_MODEL_NAME = "dummy"
+
+GRID_DIR_ENV_VAR = "TUNING_LAB_GRID_DIR"
+DEFAULT_GRID_DIR = Path(__file__).parent.parent / "data" / "grids"
+TABULATED_SUFFIX = ":tabulated"
+
+# Sample used to exercise a model once before it starts serving
+_WARM_UP_INPUT = (5.0, -2.0, 3.0)
+
+
+class ModelRegistry:
+    """
+    Registry of hit model factories with lazily built, shared instances
+
+    Reads of the active model are lock-free: the (name, model) pair is
+    replaced with a single reference assignment, so a reader always sees
+    a consistent pair even during a hot swap.
+    """
+
+    def __init__(self, default_name: Optional[str] = None):
+        self._factories: Dict[str, Callable[[], BaseHitModel]] = {}
+        self._instances: Dict[str, BaseHitModel] = {}
+        self._lock = threading.RLock()
+        self._default_name = default_name or os.environ.get(MODEL_ENV_VAR, DEFAULT_MODEL_NAME)
+        self._active: Optional[Tuple[str, BaseHitModel]] = None
+
+    def register(self, name: str, factory: Callable[[], BaseHitModel]):
+        """Register a model factory under a name (replaces any cached instance)"""
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def register_tabulated(self, base_name: str, resolution: int = DEFAULT_RESOLUTION):
+        """
+        Register '<base_name>:tabulated', a lookup-table wrapper of a registered model
+
+        The grid is stored under TUNING_LAB_GRID_DIR and memory-mapped, so
+        several worker processes share one read-only copy.
+        """
+        grid_dir = Path(os.environ.get(GRID_DIR_ENV_VAR, DEFAULT_GRID_DIR))
+        grid_path = grid_dir / f"{base_name}-{resolution}.npy"
+
+        def factory() -> BaseHitModel:
+            return TabulatedHitModel.load_or_build(self.get(base_name), grid_path, resolution)
+
+        self.register(base_name + TABULATED_SUFFIX, factory)
+
+    def available(self) -> List[str]:
+        return sorted(self._factories)
+
+    def get(self, name: str) -> BaseHitModel:
+        """Return the shared instance for a model name, building it on first use"""
+        model = self._instances.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            model = self._instances.get(name)
+            if model is None:
+                if name not in self._factories:
+                    raise KeyError(
+                        f"Unknown model '{name}' (available: {', '.join(self.available())})"
+                    )
+                model = self._factories[name]()
+                self._instances[name] = model
+            return model
+
+    @property
+    def active_name(self) -> str:
+        active = self._active
+        return active[0] if active is not None else self._default_name
+
+    def get_active(self) -> BaseHitModel:
+        """Return the active model instance"""
+        active = self._active
+        if active is None:
+            with self._lock:
+                if self._active is None:
+                    self._active = (self._default_name, self.get(self._default_name))
+                active = self._active
+        return active[1]
+
+    def warm_up(self, name: Optional[str] = None) -> BaseHitModel:
+        """Build a model (active model by default) and run one prediction through it"""
+        model = self.get(name or self.active_name)
+        model.predict(*_WARM_UP_INPUT)
+        return model
+
+    def set_active(self, name: str) -> BaseHitModel:
+        """
+        Atomically switch the active model
+
+        The new model is built and warmed up before the swap, so a model
+        that fails to load leaves the current active model in place.
+        """
+        model = self.warm_up(name)
+        with self._lock:
+            self._active = (name, model)
+        return model
+
+
+def build_default_registry() -> ModelRegistry:
+    registry = ModelRegistry()
+    registry.register("dummy", DummyHitModel)
+    registry.register("physics", PhysicsBasedHitModel)
+    registry.register("ml", MLBasedHitModel)
+    registry.register("tonefield", TonefieldSolverModel)
+    registry.register_tabulated("dummy")
+    registry.register_tabulated("tonefield")
+    return registry
+
+
+_registry = build_default_registry()
+
+
+def get_model_registry() -> ModelRegistry:
+    return _registry
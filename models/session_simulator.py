@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+Session Simulator: Offline what-if runs of whole tuning sessions
+
+A session starts from random (tonic, octave, fifth) errors and repeats
+"plan a hit, apply it, re-measure" until every error is within
+tolerance or max_rounds is reached. Sessions run as NumPy batches;
+parameter sweeps are split into (parameter set, chunk) jobs over a
+ProcessPoolExecutor and every job streams its per-session results to
+its own Parquet file, so memory stays bounded by the batch size.
+
+Response model (per round):
+    - the hit is planned with the candidate PhysicsConfig (the constants
+      under evaluation) and placed by the hit model
+    - the plate answers with the "true" constants: the realized share of
+      the primary correction is (delivered energy / needed energy)^2,
+      so too weak a hit under-corrects and too strong a hit overshoots
+    - placement: the share decays with the distance between the model's
+      (S, L) and the tonefield solver's (x, y) hit point
+    - a cooperative auxiliary moves by AUXILIARY_WEIGHT of its error,
+      untouched partials by `coupling` of the primary change
+    - relative noise on the realized share plus absolute drift
+
+Usage:
+    python -m models.session_simulator --model tonefield --sessions 100000 \\
+        --sweep threshold_c=18,20,22 scaling_s=25,30 --workers 4
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+import json
+import os
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config.physics_config import PhysicsConfig, get_physics_config
+from models.hit_model import BaseHitModel
+from models.impact_power import pure_energy, solve_impact
+from models.tonefield_solver import AUXILIARY_WEIGHT, NO_TARGET
+
+
+SIMULATION_DIR_ENV_VAR = "TUNING_LAB_SIMULATION_DIR"
+DEFAULT_SIMULATION_DIR = Path(__file__).parent.parent / "data" / "simulations"
+DEFAULT_BATCH_SIZE = 10000
+
+RESULT_SCHEMA = pa.schema([
+    ("session", pa.int64()),
+    ("rounds", pa.int32()),
+    ("converged", pa.bool_()),
+    ("hits", pa.int32()),
+    ("initial_error", pa.float64()),   # max |error| at the start
+    ("final_error", pa.float64()),     # max |error| at the end
+])
+
+
+@dataclass(frozen=True)
+class ResponseModel:
+    """How the simulated plate answers a planned hit"""
+    truth: PhysicsConfig = field(default_factory=PhysicsConfig)
+    placement_sigma: float = 0.25   # hit-point offset (tonefield units) at 61% effect
+    coupling: float = 0.1           # share of the primary change leaking into untouched partials
+    noise: float = 0.1              # relative std of the realized correction
+    drift: float = 0.05             # absolute std added to every partial per round
+
+
+@dataclass(frozen=True)
+class SessionSettings:
+    """Session loop settings"""
+    tolerance: float = 0.5
+    max_rounds: int = 30
+    initial_std: float = 10.0       # initial errors ~ N(0, std), clipped to +-50
+
+
+class BatchResult(NamedTuple):
+    """Per-session results of one batch (arrays of shape (n,))"""
+    rounds: np.ndarray
+    converged: np.ndarray
+    hits: np.ndarray
+    initial_error: np.ndarray
+    final_error: np.ndarray
+
+
+def simulate_batch(
+    model: BaseHitModel,
+    errors: np.ndarray,
+    config: PhysicsConfig,
+    response: ResponseModel,
+    settings: SessionSettings,
+    rng: np.random.Generator
+) -> BatchResult:
+    """
+    Run sessions to convergence for a batch of initial errors
+
+    Args:
+        model: Hit model placing the hits
+        errors: Initial errors, shape (n, 3) (copied)
+        config: Candidate constants used to plan the hits
+        response: Plate response model
+        settings: Session loop settings
+        rng: Random generator (noise and drift)
+    """
+    errors = np.array(errors, dtype=np.float64)
+    n = len(errors)
+    rounds = np.zeros(n, dtype=np.int32)
+    hits = np.zeros(n, dtype=np.int32)
+    initial = np.abs(errors).max(axis=1)
+    active = initial > settings.tolerance
+
+    for _ in range(settings.max_rounds):
+        idx = np.nonzero(active)[0]
+        if not len(idx):
+            break
+        e = errors[idx]
+        L, S, _ = model.predict_batch(e[:, 0], e[:, 1], e[:, 2])
+        solution, impact = solve_impact(e[:, 0], e[:, 1], e[:, 2], config)
+
+        needed = pure_energy(solution.primary_error, solution.x, solution.y, solution.primary, response.truth)
+        delivered = np.maximum(impact.force - response.truth.threshold_c, 0.0) * np.sqrt(impact.count)
+        realized = (delivered / np.maximum(needed, 1e-12)) ** 2
+        offset2 = (S - solution.x) ** 2 + (L - solution.y) ** 2
+        realized *= np.exp(-offset2 / (2.0 * response.placement_sigma ** 2))
+        realized *= 1.0 + response.noise * rng.standard_normal(len(idx))
+
+        rows = np.arange(len(idx))
+        delta = np.zeros_like(e)
+        primary_change = -solution.primary_error * realized
+        delta[rows, solution.primary] = primary_change
+
+        touched = np.zeros(e.shape, dtype=bool)
+        touched[rows, solution.primary] = True
+        has_aux = solution.auxiliary != NO_TARGET
+        aux = np.maximum(solution.auxiliary, 0)
+        delta[rows[has_aux], aux[has_aux]] = -e[rows[has_aux], aux[has_aux]] * AUXILIARY_WEIGHT * realized[has_aux]
+        touched[rows[has_aux], aux[has_aux]] = True
+
+        delta += np.where(touched, 0.0, response.coupling * primary_change[:, None])
+        errors[idx] = e + delta + rng.normal(0.0, response.drift, size=e.shape)
+
+        rounds[idx] += 1
+        hits[idx] += impact.count.astype(np.int32)
+        active[idx] = np.abs(errors[idx]).max(axis=1) > settings.tolerance
+
+    final = np.abs(errors).max(axis=1)
+    return BatchResult(rounds, final <= settings.tolerance, hits, initial, final)
+
+
+def _initial_errors(rng: np.random.Generator, n: int, settings: SessionSettings) -> np.ndarray:
+    return np.clip(rng.normal(0.0, settings.initial_std, size=(n, 3)), -50.0, 50.0)
+
+
+def run_job(
+    model_name: str,
+    overrides: Dict,
+    sessions: int,
+    first_session: int,
+    seed: Sequence[int],
+    path: Path,
+    response: ResponseModel,
+    settings: SessionSettings,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict:
+    """
+    Simulate sessions for one parameter set and stream them to a Parquet file
+
+    Runs in a worker process; returns running aggregates only.
+    """
+    from models.registry import get_model_registry
+
+    model = get_model_registry().get(model_name)
+    config = apply_overrides(get_physics_config(), overrides)
+    rng = np.random.default_rng(list(seed))
+    totals = {"sessions": 0, "converged": 0, "rounds": 0, "hits": 0, "final_error": 0.0}
+
+    with pq.ParquetWriter(path, RESULT_SCHEMA) as writer:
+        for start in range(0, sessions, batch_size):
+            count = min(batch_size, sessions - start)
+            result = simulate_batch(model, _initial_errors(rng, count, settings), config, response, settings, rng)
+            writer.write_table(pa.table({
+                "session": np.arange(first_session + start, first_session + start + count, dtype=np.int64),
+                "rounds": result.rounds,
+                "converged": result.converged,
+                "hits": result.hits,
+                "initial_error": result.initial_error,
+                "final_error": result.final_error,
+            }, schema=RESULT_SCHEMA))
+
+            totals["sessions"] += count
+            totals["converged"] += int(result.converged.sum())
+            totals["rounds"] += int(result.rounds.sum())
+            totals["hits"] += int(result.hits.sum())
+            totals["final_error"] += float(result.final_error.sum())
+    return totals
+
+
+def apply_overrides(config: PhysicsConfig, overrides: Dict) -> PhysicsConfig:
+    """PhysicsConfig with some constants replaced (stiffness_k as a 3-tuple)"""
+    overrides = dict(overrides)
+    if "stiffness_k" in overrides:
+        overrides["stiffness_k"] = tuple(float(k) for k in overrides["stiffness_k"])
+    return replace(config, **overrides)
+
+
+def parameter_grid(sweep: Dict[str, Iterable]) -> List[Dict]:
+    """Cartesian product of swept constants ({} when nothing is swept)"""
+    names = list(sweep)
+    return [dict(zip(names, values)) for values in product(*(sweep[name] for name in names))]
+
+
+def run_sweep(
+    model_name: str,
+    sweep: Dict[str, Iterable],
+    sessions: int,
+    output_dir: Optional[Path] = None,
+    response: Optional[ResponseModel] = None,
+    settings: Optional[SessionSettings] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 100000,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    seed: int = 0
+) -> Dict:
+    """
+    Simulate `sessions` sessions for every parameter set of the sweep
+
+    Each (parameter set, chunk) job writes part-p<param>-c<chunk>.parquet;
+    summary.json holds the parameters and per-set aggregates.
+
+    Returns:
+        Summary dict (also written to <output_dir>/summary.json)
+    """
+    response = response or ResponseModel()
+    settings = settings or SessionSettings()
+    run_dir = Path(output_dir or Path(os.environ.get(SIMULATION_DIR_ENV_VAR, DEFAULT_SIMULATION_DIR))
+                   / datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S"))
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    grid = parameter_grid(sweep)
+    jobs = []
+    for p, overrides in enumerate(grid):
+        for c, first in enumerate(range(0, sessions, chunk_size)):
+            path = run_dir / f"part-p{p:04d}-c{c:05d}.parquet"
+            jobs.append((p, (model_name, overrides, min(chunk_size, sessions - first), first,
+                             (seed, p, c), path, response, settings, batch_size)))
+
+    aggregates = [{"sessions": 0, "converged": 0, "rounds": 0, "hits": 0, "final_error": 0.0} for _ in grid]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(p, pool.submit(run_job, *args)) for p, args in jobs]
+        for p, future in futures:
+            for key, value in future.result().items():
+                aggregates[p][key] += value
+
+    summary = {
+        "model": model_name,
+        "sessions_per_set": sessions,
+        "settings": settings.__dict__,
+        "response": dict(response.__dict__, truth=response.truth.to_dict()),
+        "results": [
+            {
+                "index": p,
+                "overrides": {k: list(v) if isinstance(v, tuple) else v for k, v in grid[p].items()},
+                "convergence_rate": agg["converged"] / agg["sessions"],
+                "mean_rounds": agg["rounds"] / agg["sessions"],
+                "mean_hits": agg["hits"] / agg["sessions"],
+                "mean_final_error": agg["final_error"] / agg["sessions"],
+            }
+            for p, agg in enumerate(aggregates)
+        ],
+    }
+    (run_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    summary["output_dir"] = str(run_dir)
+    return summary
+
+
+def _parse_sweep(items: Sequence[str]) -> Dict[str, List]:
+    """['threshold_c=18,20', 'stiffness_k=1:0.9:1.2,1:1:1'] -> {name: [values]}"""
+    sweep = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        if name == "stiffness_k":
+            sweep[name] = [tuple(float(k) for k in v.split(":")) for v in values.split(",")]
+        else:
+            sweep[name] = [float(v) for v in values.split(",")]
+    return sweep
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate tuning sessions")
+    parser.add_argument("--model", default="tonefield", help="Registered hit model name")
+    parser.add_argument("--sessions", type=int, default=10000, help="Sessions per parameter set")
+    parser.add_argument("--sweep", nargs="*", default=[],
+                        help="Constants to sweep, e.g. threshold_c=18,20,22 stiffness_k=1:0.9:1.2,1:1:1")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="Sessions per job")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Sessions per NumPy batch")
+    parser.add_argument("--output", type=Path, help="Run directory")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    summary = run_sweep(
+        args.model, _parse_sweep(args.sweep), args.sessions, args.output,
+        workers=args.workers, chunk_size=args.chunk_size, batch_size=args.batch_size, seed=args.seed
+    )
+    print(f"Results written to {summary['output_dir']}")
+    for row in summary["results"]:
+        print(f"{row['overrides'] or 'defaults'}: converged {row['convergence_rate']:.1%}, "
+              f"{row['mean_rounds']:.2f} rounds, {row['mean_hits']:.2f} hits, "
+              f"final error {row['mean_final_error']:.3f}")
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Tabulated Hit Model: Precomputed 3-D grid with trilinear interpolation
+
+Wraps any BaseHitModel. Outputs are precomputed on a regular
+(tonic, octave, fifth) grid over the input domain (-50 ~ +50 cents)
+and saved as a .npy file that every worker can open with mmap.
+"""
+
+from typing import Optional, Tuple
+from pathlib import Path
+import json
+import math
+import os
+import tempfile
+import numpy as np
+
+from models.hit_model import BaseHitModel, as_batch_arrays
+
+
+DEFAULT_RESOLUTION = 41          # grid points per axis (2.5 cent spacing)
+DEFAULT_BOUNDS = (-50.0, 50.0)   # TuningErrorInput range (cents)
+ERROR_SAMPLES = 20000            # random samples for the interpolation error report
+
+
+class TabulatedHitModel(BaseHitModel):
+    """
+    Lookup-table model answering queries by trilinear interpolation
+
+    table has shape (resolution, resolution, resolution, 3) with axes
+    (tonic, octave, fifth) and last dimension (L, S, strength).
+    Inputs outside the bounds are clamped to the grid edge.
+    """
+
+    execution_hint = "inline"
+
+    def __init__(self, table: np.ndarray, bounds: Tuple[float, float], metadata: Optional[dict] = None):
+        if table.ndim != 4 or table.shape[-1] != 3 or len(set(table.shape[:3])) != 1:
+            raise ValueError(f"Invalid grid shape {table.shape}, expected (n, n, n, 3)")
+
+        self.table = table
+        self.bounds = (float(bounds[0]), float(bounds[1]))
+        self.resolution = table.shape[0]
+        self.step = (self.bounds[1] - self.bounds[0]) / (self.resolution - 1)
+        self.metadata = metadata or {}
+
+        base_name = self.metadata.get('base_model', 'unknown')
+        self.model_name = f"Tabulated {base_name}"
+        self.version = self.metadata.get('base_version', '0.0.0')
+
+    @classmethod
+    def build(
+        cls,
+        model: BaseHitModel,
+        resolution: int = DEFAULT_RESOLUTION,
+        bounds: Tuple[float, float] = DEFAULT_BOUNDS
+    ) -> 'TabulatedHitModel':
+        """Precompute the grid from an exact model and measure interpolation error"""
+        axis = np.linspace(bounds[0], bounds[1], resolution)
+        tonic, octave, fifth = np.meshgrid(axis, axis, axis, indexing='ij')
+        L, S, strength = model.predict_batch(tonic.ravel(), octave.ravel(), fifth.ravel())
+        table = np.stack([L, S, strength], axis=-1).reshape(resolution, resolution, resolution, 3)
+
+        info = model.get_model_info()
+        tabulated = cls(table, bounds, {
+            'base_model': info['name'],
+            'base_version': info['version'],
+            'resolution': resolution,
+            'bounds': list(bounds)
+        })
+        tabulated.metadata['max_error'] = tabulated.interpolation_error(model)
+        return tabulated
+
+    @staticmethod
+    def metadata_path(path: Path) -> Path:
+        return Path(path).with_suffix('.json')
+
+    def save(self, path: Path):
+        """Write the grid (.npy) and its metadata (.json) atomically"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.npy.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.table, dtype=np.float64))
+        os.replace(tmp_name, path)
+
+        meta = dict(self.metadata, bounds=list(self.bounds), resolution=self.resolution)
+        self.metadata_path(path).write_text(json.dumps(meta, indent=2), encoding='utf-8')
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> 'TabulatedHitModel':
+        """Open a saved grid (read-only memory map by default)"""
+        path = Path(path)
+        table = np.load(path, mmap_mode='r' if mmap else None)
+        meta = json.loads(cls.metadata_path(path).read_text(encoding='utf-8'))
+        return cls(table, tuple(meta['bounds']), meta)
+
+    @classmethod
+    def load_or_build(
+        cls,
+        model: BaseHitModel,
+        path: Path,
+        resolution: int = DEFAULT_RESOLUTION,
+        bounds: Tuple[float, float] = DEFAULT_BOUNDS
+    ) -> 'TabulatedHitModel':
+        """Load the grid if it matches the model, otherwise build and save it"""
+        path = Path(path)
+        info = model.get_model_info()
+        if path.exists() and cls.metadata_path(path).exists():
+            tabulated = cls.load(path)
+            meta = tabulated.metadata
+            if (meta.get('base_model') == info['name']
+                    and meta.get('base_version') == info['version']
+                    and tabulated.resolution == resolution
+                    and tabulated.bounds == tuple(float(b) for b in bounds)):
+                return tabulated
+
+        tabulated = cls.build(model, resolution, bounds)
+        tabulated.save(path)
+        return cls.load(path)
+
+    def _cell(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Lower grid index and fractional offset along one axis"""
+        u = np.clip((values - self.bounds[0]) / self.step, 0.0, self.resolution - 1)
+        i0 = np.minimum(np.floor(u).astype(np.intp), self.resolution - 2)
+        return i0, u - i0
+
+    def predict(self, tonic: float, octave: float, fifth: float) -> Tuple[float, float, float]:
+        coords = []
+        for value in (tonic, octave, fifth):
+            u = min(max((value - self.bounds[0]) / self.step, 0.0), self.resolution - 1)
+            i0 = min(int(math.floor(u)), self.resolution - 2)
+            coords.append((i0, u - i0))
+        (i, fi), (j, fj), (k, fk) = coords
+
+        c = np.asarray(self.table[i:i + 2, j:j + 2, k:k + 2])
+        c = c[0] * (1 - fi) + c[1] * fi
+        c = c[0] * (1 - fj) + c[1] * fj
+        c = c[0] * (1 - fk) + c[1] * fk
+        return float(c[0]), float(c[1]), float(c[2])
+
+    def predict_batch(
+        self,
+        tonic: np.ndarray,
+        octave: np.ndarray,
+        fifth: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        tonic, octave, fifth = as_batch_arrays(tonic, octave, fifth)
+        i, fi = self._cell(tonic)
+        j, fj = self._cell(octave)
+        k, fk = self._cell(fifth)
+        fi, fj, fk = fi[:, None], fj[:, None], fk[:, None]
+
+        t = self.table
+        c00 = t[i, j, k] * (1 - fi) + t[i + 1, j, k] * fi
+        c10 = t[i, j + 1, k] * (1 - fi) + t[i + 1, j + 1, k] * fi
+        c01 = t[i, j, k + 1] * (1 - fi) + t[i + 1, j, k + 1] * fi
+        c11 = t[i, j + 1, k + 1] * (1 - fi) + t[i + 1, j + 1, k + 1] * fi
+        c0 = c00 * (1 - fj) + c10 * fj
+        c1 = c01 * (1 - fj) + c11 * fj
+        out = c0 * (1 - fk) + c1 * fk
+        return out[:, 0], out[:, 1], out[:, 2]
+
+    def interpolation_error(self, model: BaseHitModel, samples: int = ERROR_SAMPLES, seed: int = 0) -> dict:
+        """Max absolute error against the exact model on random in-domain samples"""
+        rng = np.random.default_rng(seed)
+        tonic, octave, fifth = rng.uniform(self.bounds[0], self.bounds[1], size=(3, samples))
+        exact = model.predict_batch(tonic, octave, fifth)
+        approx = self.predict_batch(tonic, octave, fifth)
+        return {
+            name: float(np.max(np.abs(e - a)))
+            for name, e, a in zip(("L", "S", "strength"), exact, approx)
+        }
+
+    def get_model_info(self) -> dict:
+        return {
+            "name": self.model_name,
+            "version": self.version,
+            "description": (
+                f"Trilinear lookup table ({self.resolution}^3 grid, "
+                f"{self.bounds[0]:g} ~ {self.bounds[1]:g} cents) over {self.metadata.get('base_model')}"
+            ),
+            "resolution": self.resolution,
+            "max_error": self.metadata.get('max_error')
+        }
+
+
+if __name__ == "__main__":
+    # Usage: python -m models.tabulated [model_name] [resolution]
+    import sys
+    from models.registry import get_model_registry
+
+    base_name = sys.argv[1] if len(sys.argv) > 1 else "dummy"
+    resolution = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RESOLUTION
+    model = get_model_registry().get(base_name)
+
+    tabulated = TabulatedHitModel.build(model, resolution)
+    print(f"Base Model: {model.get_model_info()['name']}")
+    print(f"Grid: {resolution}^3 points, {tabulated.table.nbytes / 1e6:.1f} MB")
+    for name, error in tabulated.metadata['max_error'].items():
+        print(f"Max interpolation error ({name}): {error:.6f}")
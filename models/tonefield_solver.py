@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Tonefield Solver: Python port of the tonefield coordinate algorithm
+
+Primary/auxiliary target selection, cooperative-sign check, 0.35
+auxiliary weight and elliptical boundary clamp
+(tuning-console/docs/TECHNICAL_SPECIFICATION.md, section 3.2).
+
+Coordinates: x = fifth (short) axis, y = tonic/octave (long) axis.
+Every step is computed over whole arrays without per-sample branching.
+"""
+
+from typing import Dict, NamedTuple, Tuple
+import numpy as np
+
+from models.hit_model import BaseHitModel, as_batch_arrays
+
+
+# Target codes (index into TARGET_NAMES); NO_TARGET marks "no auxiliary"
+TONIC, OCTAVE, FIFTH = 0, 1, 2
+NO_TARGET = -1
+TARGET_NAMES = ("tonic", "octave", "fifth")
+TARGET_DISPLAY_NAMES = ("토닉", "옥타브", "5도")
+
+# Ellipse radii (TonefieldCanvas / TuningPhysicsConfig)
+RADIUS_X = 0.6   # short axis (fifth)
+RADIUS_Y = 0.85  # long axis (tonic/octave)
+
+# Error normalizers per axis
+VERTICAL_NORMALIZER = 20.0
+HORIZONTAL_NORMALIZER = 30.0
+
+AUXILIARY_WEIGHT = 0.35     # auxiliary target influence (35%)
+AUXILIARY_MIN_ERROR = 0.3   # auxiliary ignored below this error
+
+
+class TonefieldSolution(NamedTuple):
+    """Columnar solver result (all arrays have shape (n,))"""
+    x: np.ndarray              # short axis coordinate (fifth)
+    y: np.ndarray              # long axis coordinate (tonic/octave)
+    primary: np.ndarray        # primary target code (TONIC/OCTAVE/FIFTH)
+    auxiliary: np.ndarray      # cooperative auxiliary target code or NO_TARGET
+    primary_error: np.ndarray  # signed error of the primary target
+    radius: np.ndarray         # normalized elliptical radius (0.0 ~ 1.0)
+
+
+def _axis_offset(signed_error: np.ndarray, abs_error: np.ndarray, vertical: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Map signed errors to (x, y) offsets along the target's own axis"""
+    sign = np.where(signed_error < 0, -1.0, 1.0)
+    dy = sign * np.minimum(abs_error / VERTICAL_NORMALIZER, RADIUS_Y)
+    dx = sign * np.minimum(abs_error / HORIZONTAL_NORMALIZER, RADIUS_X)
+    return np.where(vertical, 0.0, dx), np.where(vertical, dy, 0.0)
+
+
+def solve(tonic: np.ndarray, octave: np.ndarray, fifth: np.ndarray) -> TonefieldSolution:
+    """
+    Compute hit coordinates for arrays of tuning errors
+
+    Args:
+        tonic: Tonic tuning errors (signed)
+        octave: Octave tuning errors (signed)
+        fifth: Fifth tuning errors (signed)
+
+    Returns:
+        TonefieldSolution with columnar results
+    """
+    tonic, octave, fifth = as_batch_arrays(tonic, octave, fifth)
+    errors = np.stack([tonic, octave, fifth])
+    abs_errors = np.abs(errors)
+    abs_t, abs_o, abs_f = abs_errors
+
+    # 1. Primary target: largest absolute error (ties: tonic > octave > fifth)
+    is_tonic = (abs_t >= abs_o) & (abs_t >= abs_f)
+    primary = np.where(is_tonic, TONIC, np.where(abs_o >= abs_f, OCTAVE, FIFTH))
+
+    # 2. Auxiliary candidate: only for tonic primaries, larger of octave/fifth
+    auxiliary = np.full(primary.shape, NO_TARGET)
+    auxiliary[is_tonic & (abs_o > abs_f) & (abs_o >= AUXILIARY_MIN_ERROR)] = OCTAVE
+    auxiliary[is_tonic & (abs_f > abs_o) & (abs_f >= AUXILIARY_MIN_ERROR)] = FIFTH
+
+    columns = np.arange(primary.shape[0])
+    primary_error = errors[primary, columns]
+    aux_index = np.maximum(auxiliary, 0)
+    aux_error = errors[aux_index, columns]
+
+    # 3. Cooperative check: auxiliary kept only when it shares the primary's sign
+    cooperative = (auxiliary != NO_TARGET) & (
+        ((primary_error < 0) & (aux_error < 0)) | ((primary_error > 0) & (aux_error > 0))
+    )
+    auxiliary = np.where(cooperative, auxiliary, NO_TARGET)
+
+    # 4. Base coordinate from the primary target
+    x, y = _axis_offset(primary_error, abs_errors[primary, columns], primary != FIFTH)
+
+    # 5. Weighted auxiliary contribution
+    aux_x, aux_y = _axis_offset(aux_error, abs_errors[aux_index, columns], aux_index != FIFTH)
+    weight = np.where(cooperative, AUXILIARY_WEIGHT, 0.0)
+    x = x + weight * aux_x
+    y = y + weight * aux_y
+
+    # 6. Elliptical boundary: (x/0.6)^2 + (y/0.85)^2 <= 1
+    ratio = (x / RADIUS_X) ** 2 + (y / RADIUS_Y) ** 2
+    scale = np.sqrt(np.maximum(ratio, 1.0))
+    x = x / scale
+    y = y / scale
+
+    return TonefieldSolution(
+        x=x,
+        y=y,
+        primary=primary,
+        auxiliary=auxiliary,
+        primary_error=primary_error,
+        radius=np.sqrt(np.minimum(ratio, 1.0))
+    )
+
+
+def hit_point_columns(solution: TonefieldSolution) -> Dict[str, np.ndarray]:
+    """
+    Convert a solution to hit_points table columns
+    (coordinate, target and location fields of tuning-console/supabase/schema.sql)
+    """
+    names = np.array(TARGET_NAMES + (None,), dtype=object)
+    display = np.array(TARGET_DISPLAY_NAMES, dtype=object)
+
+    primary_display = display[solution.primary]
+    aux_display = np.array(TARGET_DISPLAY_NAMES + ("",), dtype=object)[solution.auxiliary]
+    is_compound = solution.auxiliary != NO_TARGET
+    target_display = np.where(
+        is_compound,
+        primary_display + " (+" + aux_display + ")",
+        primary_display
+    )
+
+    internal = solution.primary_error < 0
+    return {
+        "coordinate_x": solution.x,
+        "coordinate_y": solution.y,
+        "primary_target": names[solution.primary],
+        "auxiliary_target": names[solution.auxiliary],
+        "is_compound": is_compound,
+        "target_display": target_display,
+        "location": np.where(internal, "internal", "external").astype(object),
+        "intent": np.where(internal, "상향", "하향").astype(object),
+    }
+
+
+class TonefieldSolverModel(BaseHitModel):
+    """
+    Tonefield coordinate solver model
+    Same algorithm as the tuning console, served from Python
+
+    Output mapping: L = y (long axis), S = x (short axis),
+    strength = normalized elliptical radius of the hit point
+    """
+
+    execution_hint = "inline"
+
+    def __init__(self):
+        self.model_name = "Tonefield Coordinate Solver"
+        self.version = "1.0.0"
+
+    def predict(self, tonic: float, octave: float, fifth: float) -> Tuple[float, float, float]:
+        L, S, strength = self.predict_batch(tonic, octave, fifth)
+        return float(L[0]), float(S[0]), float(strength[0])
+
+    def predict_batch(
+        self,
+        tonic: np.ndarray,
+        octave: np.ndarray,
+        fifth: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        solution = solve(tonic, octave, fifth)
+        return solution.y, solution.x, solution.radius
+
+    def get_model_info(self) -> dict:
+        return {
+            "name": self.model_name,
+            "version": self.version,
+            "description": "Primary/auxiliary target solver with elliptical boundary clamp",
+            "formula": {
+                "L": "sign * min(|primary| / 20, 0.85) (+ 0.35 * cooperative octave)",
+                "S": "sign * min(|fifth| / 30, 0.6) (primary or 0.35 * cooperative)",
+                "strength": "sqrt((S / 0.6)^2 + (L / 0.85)^2), clamped to 1.0"
+            }
+        }
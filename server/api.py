@@ -6,10 +6,16 @@ API for converting tuning errors to tonefield coordinates
 For integration with Flutter app or external clients
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
+import numpy as np
+import asyncio
+import os
 import sys
 from pathlib import Path
 
@@ -17,13 +23,62 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from models.hit_model import get_active_model
+from models.registry import get_model_registry
+from models.prediction_cache import get_prediction_cache
+from server.executor import ExecutorBusyError, get_inference_executor
+from server.batching import batching_enabled, get_micro_batcher
+from server.streaming import serve_prediction_stream
+from server.osc_publisher import get_osc_publisher, osc_enabled
+from server.instrumentation import InstrumentedRoute, get_request_metrics, mark_stage
+from server.profiling import ProfilingMiddleware, get_request_profiler
+from server.encoding import BINARY_MEDIA_TYPES, columnar_response, json_response, negotiate, rows_to_columns
+from models.tonefield_solver import hit_point_columns
+from models.impact_power import HAMMERING_TYPE_NAMES, solve_impact
+from storage.hit_points_repository import COLUMNS, get_hit_points_repository, records_from_errors
+from storage.hit_points_index import MAX_NEIGHBOURS, get_hit_point_index
+from config.field_geometry import (
+    GEOMETRY_FILE_ENV_VAR, DEFAULT_GEOMETRY_FILE, TonefieldGeometry, get_geometry_config
+)
+from models.instrument_plan import DEFAULT_TOLERANCE, NoteErrors, plan_instrument
+from config.physics_config import get_calibration_version, get_physics_config
+
+
+MAX_JSON_PAGE_SIZE = 1000
+MAX_BULK_PAGE_SIZE = 100000
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build and warm up the active model, watch the instrument geometry file, start the OSC feed"""
+    await run_in_threadpool(get_model_registry().warm_up)
+    if osc_enabled():
+        await get_osc_publisher().start()
+
+    geometry_file = Path(os.environ.get(GEOMETRY_FILE_ENV_VAR, DEFAULT_GEOMETRY_FILE))
+    stop_watching = asyncio.Event()
+    watcher = None
+    if geometry_file.parent.is_dir():
+        watcher = asyncio.create_task(get_geometry_config().watch(geometry_file, stop_watching))
+
+    yield
+
+    stop_watching.set()
+    if watcher is not None:
+        await watcher
+    await get_osc_publisher().stop()
+    get_request_profiler().sampler.stop()
+    await get_micro_batcher().shutdown()
+    get_inference_executor().shutdown()
 
 
 app = FastAPI(
     title="Tuning Lab API",
     description="Piano tuning error to tonefield coordinate conversion API",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
+# Per-route latency / in-flight tracking (see server.instrumentation)
+app.router.route_class = InstrumentedRoute
 
 # CORS settings for Next.js frontend
 app.add_middleware(
@@ -34,6 +89,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# On-demand request profiler (off until enabled via PUT /admin/profiler)
+app.add_middleware(ProfilingMiddleware)
+
+
+@app.exception_handler(ExecutorBusyError)
+async def executor_busy_handler(request: Request, exc: ExecutorBusyError):
+    """Back-pressure: inference queue is full"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Inference queue is full, retry later"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 
 class TuningErrorInput(BaseModel):
     """Tuning error input model"""
@@ -59,6 +127,179 @@ class HitPointOutput(BaseModel):
     S: float = Field(..., description="Short dimension coordinate")
     strength: float = Field(..., description="Hit strength (0.0 ~ 1.0)")
     model_name: str = Field(..., description="Model name used for prediction")
+    neighbours: Optional[List["NeighbourOutput"]] = Field(
+        None, description="Most similar stored hit points (only with ?neighbours=k)"
+    )
+
+
+class BatchTuningErrorInput(BaseModel):
+    """Columnar batch of tuning errors (one list per axis, equal length)"""
+    tonic: List[float] = Field(..., description="Tonic tuning errors (cents)")
+    octave: List[float] = Field(..., description="Octave tuning errors (cents)")
+    fifth: List[float] = Field(..., description="Fifth tuning errors (cents)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "tonic": [5.0, -3.5],
+                "octave": [-2.0, 1.0],
+                "fifth": [3.0, 0.0]
+            }
+        }
+
+
+class BatchHitPointOutput(BaseModel):
+    """Columnar batch of hit point coordinates"""
+    L: List[float] = Field(..., description="Long dimension coordinates")
+    S: List[float] = Field(..., description="Short dimension coordinates")
+    strength: List[float] = Field(..., description="Hit strengths (0.0 ~ 1.0)")
+    count: int = Field(..., description="Number of predictions")
+    model_name: str = Field(..., description="Model name used for prediction")
+
+
+class ImpactOutput(BaseModel):
+    """Impact calculation output model (hit_points column names)"""
+    coordinate_x: float = Field(..., description="Short axis (fifth) coordinate")
+    coordinate_y: float = Field(..., description="Long axis (tonic/octave) coordinate")
+    primary_target: str = Field(..., description="Primary tuning target")
+    auxiliary_target: Optional[str] = Field(None, description="Cooperative auxiliary target")
+    strength: float = Field(..., description="Machine-calibrated force per hit (Level)")
+    hit_count: int = Field(..., description="Number of hits")
+    hammering_type: str = Field(..., description="Hammering type (SNAP/PULL/PRESS)")
+
+
+class BatchImpactOutput(BaseModel):
+    """Columnar batch of impact calculation outputs"""
+    coordinate_x: List[float]
+    coordinate_y: List[float]
+    primary_target: List[str]
+    auxiliary_target: List[Optional[str]]
+    strength: List[float] = Field(..., description="Machine-calibrated forces per hit (Level)")
+    hit_count: List[int]
+    hammering_type: List[str]
+    count: int = Field(..., description="Number of calculations")
+
+
+class HitPointsInput(BatchTuningErrorInput):
+    """Columnar batch of tuning errors to store as hit points"""
+    note: Optional[str] = Field(None, description="Note name (e.g., 'A4', 'C3')")
+
+
+class HitPointRecord(BaseModel):
+    """Stored hit point (hit_points table row)"""
+    id: str
+    tonic: float
+    octave: float
+    fifth: float
+    note: Optional[str] = None
+    tuning_target: Optional[str] = None
+    primary_target: Optional[str] = None
+    auxiliary_target: Optional[str] = None
+    is_compound: bool = False
+    target_display: Optional[str] = None
+    coordinate_x: float
+    coordinate_y: float
+    strength: float
+    hit_count: Optional[int] = None
+    location: str
+    intent: str
+    hammering_type: Optional[str] = None
+    created_at: str
+
+
+class NeighbourOutput(HitPointRecord):
+    """Stored hit point with its distance (cents) from the queried errors"""
+    distance: float
+
+
+HitPointOutput.model_rebuild()
+
+
+class HitPointsInsertOutput(BaseModel):
+    """Ids of inserted hit points"""
+    ids: List[str]
+    count: int
+
+
+class HitPointsPage(BaseModel):
+    """Newest-first page of hit points"""
+    items: List[HitPointRecord]
+    next_cursor: Optional[str] = Field(None, description="Pass as 'cursor' for the next page")
+
+
+class EllipseInput(BaseModel):
+    """Ellipse parameters (config.field_geometry.EllipseParams)"""
+    center_x: float = 0.0
+    center_y: float = 0.0
+    semi_major: float = Field(..., gt=0)
+    semi_minor: float = Field(..., gt=0)
+    rotation: float = 0.0
+
+
+class GeometryInput(BaseModel):
+    """Tonefield geometry (config.field_geometry.TonefieldGeometry)"""
+    field_size: float = Field(..., gt=0)
+    ellipse: EllipseInput
+    scale_factor: float = Field(1.0, gt=0)
+
+
+class NoteErrorInput(TuningErrorInput):
+    """Tuning errors of one instrument note"""
+    note_name: str = Field(..., description="Note name (e.g., 'A4', 'C3')")
+    geometry: Optional[GeometryInput] = Field(
+        None, description="Tonefield geometry (default: loaded instrument geometry for the note)"
+    )
+
+
+class InstrumentPlanInput(BaseModel):
+    """Errors of every note of an instrument"""
+    notes: List[NoteErrorInput] = Field(..., min_length=1, max_length=64)
+    tolerance: float = Field(DEFAULT_TOLERANCE, ge=0.0, description="Notes within tolerance are skipped")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "notes": [
+                    {"note_name": "D3", "tonic": 3.0, "octave": -1.0, "fifth": 0.5},
+                    {"note_name": "A3", "tonic": -12.0, "octave": -4.0, "fifth": 2.0},
+                    {"note_name": "C4", "tonic": 1.5, "octave": 6.0, "fifth": -2.5}
+                ],
+                "tolerance": 0.5
+            }
+        }
+
+
+class PlanStepOutput(BaseModel):
+    """One note of the hammering plan"""
+    priority: int
+    note: str
+    tonic: float
+    octave: float
+    fifth: float
+    L: float
+    S: float
+    strength: float = Field(..., description="Model hit strength (0.0 ~ 1.0)")
+    coordinate_x: float
+    coordinate_y: float
+    primary_target: str
+    auxiliary_target: Optional[str] = None
+    target_display: str
+    location: str
+    intent: str
+    force: float = Field(..., description="Machine-calibrated force per hit (Level)")
+    hit_count: int
+    hammering_type: str
+    coverage: float = Field(..., description="Share of the error corrected by the planned hits")
+    expected_reduction: float
+
+
+class InstrumentPlanOutput(BaseModel):
+    """Prioritized hammering plan for the whole instrument"""
+    steps: List[PlanStepOutput]
+    in_tune: List[str]
+    model_name: str
+    total_hits: int
+    total_expected_reduction: float
 
 
 class ModelInfoOutput(BaseModel):
@@ -68,6 +309,40 @@ class ModelInfoOutput(BaseModel):
     description: str
 
 
+class ModelSelectInput(BaseModel):
+    """Active model selection input model"""
+    name: str = Field(..., description="Registered model name (e.g., 'dummy')")
+
+
+class ActiveModelOutput(BaseModel):
+    """Active model selection output model"""
+    active: str
+    available: List[str]
+    info: ModelInfoOutput
+
+
+class ProfilerSettingsInput(BaseModel):
+    """Runtime profiler settings"""
+    enabled: bool
+    sample_rate: float = Field(0.0, ge=0.0, le=1.0, description="Fraction of requests profiled with cProfile")
+    slow_ms: Optional[float] = Field(None, gt=0.0, description="Always capture requests slower than this (ms)")
+    interval_ms: Optional[float] = Field(None, ge=0.1, le=100.0, description="Stack sampling interval (ms)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {"enabled": True, "sample_rate": 0.01, "slow_ms": 50.0}
+        }
+
+
+def _model_info_output(model) -> ModelInfoOutput:
+    info = model.get_model_info()
+    return ModelInfoOutput(
+        name=info['name'],
+        version=info['version'],
+        description=info['description']
+    )
+
+
 @app.get("/")
 async def root():
     return {
@@ -75,47 +350,398 @@ async def root():
         "version": "0.1.0",
         "endpoints": {
             "predict": "/predict",
+            "predict_batch": "/predict/batch",
+            "predict_stream": "/ws/predict",
+            "impact": "/impact",
+            "impact_batch": "/impact/batch",
+            "hit_points": "/hit-points",
+            "instrument_plan": "/instrument/plan",
             "model_info": "/model/info",
+            "model_active": "/model/active",
+            "geometry": "/geometry",
+            "physics": "/physics",
+            "cache_metrics": "/metrics/cache",
+            "executor_metrics": "/metrics/executor",
+            "batching_metrics": "/metrics/batching",
+            "osc_metrics": "/metrics/osc",
+            "metrics": "/metrics",
+            "profiler": "/admin/profiler",
             "docs": "/docs"
         }
     }
 
 
-@app.post("/predict", response_model=HitPointOutput)
-async def predict_hit_point(input_data: TuningErrorInput):
-    """Predict hit point from tuning errors"""
-    try:
-        model = get_active_model()
-        L, S, strength = model.predict(
-            tonic=input_data.tonic,
-            octave=input_data.octave,
-            fifth=input_data.fifth
+def _note_geometry(note_name: Optional[str]):
+    """Geometry for a requested note (None: model default); 404 for notes missing from a loaded instrument"""
+    if not note_name:
+        return None
+    config = get_geometry_config()
+    if config.has_geometry(note_name):
+        return config.get_geometry(note_name)
+    if config.notes():
+        raise HTTPException(
+            status_code=404,
+            detail=f"No geometry for note '{note_name}' (instrument notes: {config.notes()})"
         )
-        return HitPointOutput(
+    return None
+
+
+@app.post("/predict", response_model=HitPointOutput, response_model_exclude_none=True)
+async def predict_hit_point(
+    input_data: TuningErrorInput,
+    neighbours: int = Query(0, ge=0, le=MAX_NEIGHBOURS, description="Also return the k most similar stored hit points")
+):
+    """Predict hit point from tuning errors (with the note's tonefield geometry if given)"""
+    mark_stage("parse")
+    geometry = _note_geometry(input_data.note_name)
+    try:
+        if geometry is None and batching_enabled():
+            model_name, (L, S, strength) = await get_micro_batcher().predict(
+                input_data.tonic,
+                input_data.octave,
+                input_data.fifth
+            )
+        else:
+            model_name, (L, S, strength) = await get_inference_executor().predict(
+                input_data.tonic,
+                input_data.octave,
+                input_data.fifth,
+                geometry
+            )
+        _observe_model(model_name, mark_stage("model"))
+        get_osc_publisher().publish(input_data.tonic, input_data.octave, input_data.fifth, L, S, strength)
+        similar = None
+        if neighbours:
+            similar = await run_in_threadpool(
+                get_hit_point_index().nearest,
+                input_data.tonic, input_data.octave, input_data.fifth, neighbours
+            )
+            mark_stage("neighbours")
+        output = HitPointOutput(
             L=L,
             S=S,
             strength=strength,
-            model_name=model.get_model_info()['name']
+            model_name=model_name,
+            neighbours=similar
         )
+        mark_stage("response")
+        return output
+    except ExecutorBusyError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
+@app.post("/predict/batch", response_model=BatchHitPointOutput)
+async def predict_hit_points_batch(input_data: BatchTuningErrorInput, request: Request):
+    """Predict hit points for a columnar batch of tuning errors (JSON, Arrow IPC or MessagePack)"""
+    mark_stage("parse")
+    media_type = negotiate(request)
+    tonic, octave, fifth = _batch_error_arrays(input_data)
+
+    try:
+        model_name, (L, S, strength) = await get_inference_executor().predict_batch(
+            tonic, octave, fifth
+        )
+        _observe_model(model_name, mark_stage("model"))
+        if tonic.size:
+            get_osc_publisher().publish(tonic[-1], octave[-1], fifth[-1], L[-1], S[-1], strength[-1])
+        output = columnar_response(
+            media_type,
+            {"L": L, "S": S, "strength": strength},
+            {"count": int(tonic.shape[0]), "model_name": model_name}
+        )
+        mark_stage("response")
+        return output
+    except ExecutorBusyError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
+
+def _observe_model(model_name: str, seconds: float):
+    """Model latency by name/version (version of the active model when the names match)"""
+    metrics = get_request_metrics()
+    if metrics.enabled:
+        model = get_active_model()
+        version = getattr(model, 'version', '') if getattr(model, 'model_name', model_name) == model_name else ''
+        metrics.observe_model(model_name, version, seconds)
+
+
+def _batch_error_arrays(input_data: BatchTuningErrorInput):
+    """Validate a columnar batch and convert it to float64 arrays"""
+    tonic = np.asarray(input_data.tonic, dtype=np.float64)
+    octave = np.asarray(input_data.octave, dtype=np.float64)
+    fifth = np.asarray(input_data.fifth, dtype=np.float64)
+
+    if not (tonic.shape == octave.shape == fifth.shape):
+        raise HTTPException(
+            status_code=422,
+            detail="tonic, octave and fifth must have the same length"
+        )
+    for axis, values in (("tonic", tonic), ("octave", octave), ("fifth", fifth)):
+        if values.size and (values.min() < -50.0 or values.max() > 50.0):
+            raise HTTPException(
+                status_code=422,
+                detail=f"{axis} values must be within -50.0 ~ 50.0 cents"
+            )
+    return tonic, octave, fifth
+
+
+@app.post("/impact", response_model=ImpactOutput)
+async def calculate_impact(input_data: TuningErrorInput):
+    """Calculate hit coordinate, machine force, hit count and hammering type"""
+    try:
+        solution, impact = solve_impact(input_data.tonic, input_data.octave, input_data.fifth)
+        columns = hit_point_columns(solution)
+        return ImpactOutput(
+            coordinate_x=float(solution.x[0]),
+            coordinate_y=float(solution.y[0]),
+            primary_target=columns['primary_target'][0],
+            auxiliary_target=columns['auxiliary_target'][0],
+            strength=float(impact.force[0]),
+            hit_count=int(impact.count[0]),
+            hammering_type=HAMMERING_TYPE_NAMES[impact.hammering_type[0]]
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Impact calculation failed: {str(e)}")
+
+
+@app.post("/impact/batch", response_model=BatchImpactOutput)
+async def calculate_impact_batch(input_data: BatchTuningErrorInput, request: Request):
+    """Calculate impact parameters for a columnar batch of tuning errors (JSON, Arrow IPC or MessagePack)"""
+    media_type = negotiate(request)
+    tonic, octave, fifth = _batch_error_arrays(input_data)
+    try:
+        solution, impact = solve_impact(tonic, octave, fifth)
+        columns = hit_point_columns(solution)
+        return columnar_response(
+            media_type,
+            {
+                "coordinate_x": solution.x,
+                "coordinate_y": solution.y,
+                "primary_target": columns['primary_target'],
+                "auxiliary_target": columns['auxiliary_target'],
+                "strength": impact.force,
+                "hit_count": impact.count,
+                "hammering_type": np.array(HAMMERING_TYPE_NAMES)[impact.hammering_type],
+            },
+            {"count": int(tonic.shape[0])}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch impact calculation failed: {str(e)}")
+
+
+@app.post("/hit-points", response_model=HitPointsInsertOutput)
+async def create_hit_points(input_data: HitPointsInput):
+    """Solve and store a columnar batch of tuning errors (single bulk insert)"""
+    tonic, octave, fifth = _batch_error_arrays(input_data)
+    records = records_from_errors(tonic, octave, fifth, note=input_data.note)
+    ids = await run_in_threadpool(get_hit_points_repository().insert_many, records)
+    return HitPointsInsertOutput(ids=ids, count=len(ids))
+
+
+@app.get("/hit-points", response_model=HitPointsPage)
+async def list_hit_points(
+    request: Request,
+    limit: int = Query(100, ge=1, le=MAX_BULK_PAGE_SIZE, description=f"At most {MAX_JSON_PAGE_SIZE} for JSON"),
+    cursor: Optional[str] = None,
+    note: Optional[str] = None,
+    location: Optional[str] = None,
+    tuning_target: Optional[str] = None
+):
+    """
+    List stored hit points, newest first (keyset pagination via 'cursor')
+
+    JSON pages are lists of records; Arrow IPC / MessagePack pages are
+    columnar and may hold up to MAX_BULK_PAGE_SIZE rows.
+    """
+    media_type = negotiate(request)
+    if media_type not in BINARY_MEDIA_TYPES and limit > MAX_JSON_PAGE_SIZE:
+        raise HTTPException(
+            status_code=422,
+            detail=f"JSON pages hold at most {MAX_JSON_PAGE_SIZE} rows; request Arrow IPC or MessagePack for larger pages"
+        )
+    try:
+        rows, next_cursor = await run_in_threadpool(
+            get_hit_points_repository().page,
+            limit, cursor, note=note, location=location, tuning_target=tuning_target
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if media_type in BINARY_MEDIA_TYPES:
+        return columnar_response(media_type, rows_to_columns(rows, COLUMNS), {"next_cursor": next_cursor})
+    # Rows come straight from the table, which already matches HitPointRecord
+    return json_response({"items": rows, "next_cursor": next_cursor})
+
+
+@app.get("/hit-points/{hit_point_id}", response_model=HitPointRecord)
+async def get_hit_point(hit_point_id: str):
+    """Get one stored hit point"""
+    row = await run_in_threadpool(get_hit_points_repository().get, hit_point_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Hit point '{hit_point_id}' not found")
+    return row
+
+
+@app.post("/instrument/plan", response_model=InstrumentPlanOutput)
+async def plan_instrument_hits(input_data: InstrumentPlanInput):
+    """Score every note of an instrument in one pass and return a prioritized hammering plan"""
+    notes = [
+        NoteErrors(
+            note=n.note_name,
+            tonic=n.tonic,
+            octave=n.octave,
+            fifth=n.fifth,
+            geometry=TonefieldGeometry.from_dict(n.geometry.model_dump()) if n.geometry else None
+        )
+        for n in input_data.notes
+    ]
+    try:
+        plan = await run_in_threadpool(plan_instrument, notes, None, None, input_data.tolerance)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Instrument plan failed: {str(e)}")
+    return InstrumentPlanOutput(**plan._asdict())
+
+
+@app.websocket("/ws/predict")
+async def websocket_predict(websocket: WebSocket):
+    """Stream predictions for live tuning-error feeds (JSON or packed float32 frames)"""
+    await serve_prediction_stream(websocket)
+
+
 @app.get("/model/info", response_model=ModelInfoOutput)
 async def get_model_info():
     """Get current active model information"""
     try:
-        model = get_active_model()
-        info = model.get_model_info()
-        return ModelInfoOutput(
-            name=info['name'],
-            version=info['version'],
-            description=info['description']
-        )
+        return _model_info_output(get_active_model())
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get model info: {str(e)}")
 
 
+@app.get("/model/active", response_model=ActiveModelOutput)
+async def get_active_model_name():
+    """Get active model name and registered model names"""
+    registry = get_model_registry()
+    return ActiveModelOutput(
+        active=registry.active_name,
+        available=registry.available(),
+        info=_model_info_output(registry.get_active())
+    )
+
+
+@app.put("/model/active", response_model=ActiveModelOutput)
+async def set_active_model(input_data: ModelSelectInput):
+    """Hot-swap the active model (built and warmed up before the switch)"""
+    registry = get_model_registry()
+    if input_data.name not in registry.available():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown model '{input_data.name}' (available: {registry.available()})"
+        )
+    try:
+        model = await run_in_threadpool(registry.set_active, input_data.name)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to activate model: {str(e)}")
+    return ActiveModelOutput(
+        active=registry.active_name,
+        available=registry.available(),
+        info=_model_info_output(model)
+    )
+
+
+@app.get("/admin/profiler")
+async def get_profiler_settings():
+    """Profiler settings and capture counters"""
+    return get_request_profiler().settings()
+
+
+@app.put("/admin/profiler")
+async def set_profiler_settings(input_data: ProfilerSettingsInput):
+    """Switch the request profiler on/off and set sampling fraction and slow threshold"""
+    profiler = get_request_profiler()
+    profiler.configure(
+        enabled=input_data.enabled,
+        sample_rate=input_data.sample_rate,
+        slow_ms=input_data.slow_ms,
+        interval_ms=input_data.interval_ms
+    )
+    return profiler.settings()
+
+
+@app.get("/admin/profiles")
+async def list_profiles():
+    """Captured profiles (.pstats / .collapsed), newest first"""
+    return {"items": get_request_profiler().list_profiles()}
+
+
+@app.get("/admin/profiles/{name}")
+async def download_profile(name: str):
+    """Download one captured profile"""
+    path = get_request_profiler().profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{name}' not found")
+    return FileResponse(path, filename=name, media_type="application/octet-stream")
+
+
+@app.get("/geometry")
+async def get_geometries():
+    """Loaded instrument geometries by note"""
+    config = get_geometry_config()
+    return {
+        "instrument": config.instrument,
+        "source": str(config.source) if config.source else None,
+        "version": config.version,
+        "default": dict(config.get_geometry().to_dict(), hash=config.get_geometry().content_hash()),
+        "notes": {
+            note: dict(config.get_geometry(note).to_dict(), hash=config.get_geometry(note).content_hash())
+            for note in config.notes()
+        }
+    }
+
+
+@app.get("/physics")
+async def get_physics():
+    """Active physics constants and the calibration version they came from (None: built-in defaults)"""
+    return {
+        "calibration_version": get_calibration_version(),
+        "config": get_physics_config().to_dict()
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """Route/stage/model latency histograms and in-flight requests (Prometheus text format)"""
+    return PlainTextResponse(
+        get_request_metrics().render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/metrics/cache")
+async def get_cache_metrics():
+    """Prediction cache size and hit/miss/eviction counters"""
+    return get_prediction_cache().stats()
+
+
+@app.get("/metrics/executor")
+async def get_executor_metrics():
+    """Inference executor mode, queue depth and rejection count"""
+    return get_inference_executor().stats()
+
+
+@app.get("/metrics/batching")
+async def get_batching_metrics():
+    """Micro-batching configuration, batch size and latency histograms"""
+    return dict(get_micro_batcher().stats(), enabled=batching_enabled())
+
+
+@app.get("/metrics/osc")
+async def get_osc_metrics():
+    """OSC publisher target, frame rate and sent/coalesced/stale frame counts"""
+    return get_osc_publisher().stats()
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "tuning-lab-api"}
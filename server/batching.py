@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-Batching: Coalesce concurrent single-point predictions
+
+Concurrent /predict calls are queued and flushed as one vectorized
+predict_batch() call when either max_batch_size items are waiting or
+max_wait_us has passed since the first one arrived.
+
+Enabled with TUNING_LAB_BATCHING=1. Batched predictions bypass the
+prediction cache (the batch call itself is the amortization).
+"""
+
+from typing import List, Optional, Set, Tuple
+import asyncio
+import os
+import time
+import numpy as np
+
+from server.executor import ExecutorBusyError, get_inference_executor
+from server.metrics import BATCH_SIZE_BUCKETS, Histogram
+
+
+BATCHING_ENV_VAR = "TUNING_LAB_BATCHING"
+BATCH_MAX_SIZE_ENV_VAR = "TUNING_LAB_BATCH_MAX_SIZE"
+BATCH_MAX_WAIT_ENV_VAR = "TUNING_LAB_BATCH_MAX_WAIT_US"
+BATCH_QUEUE_ENV_VAR = "TUNING_LAB_BATCH_QUEUE"
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_US = 500
+DEFAULT_MAX_QUEUE = 4096
+
+_PendingItem = Tuple[float, float, float, asyncio.Future]
+
+
+class MicroBatcher:
+    """
+    Dynamic batching layer in front of InferenceExecutor.predict_batch
+
+    Args:
+        max_batch_size: Flush when this many requests are waiting
+        max_wait_us: Flush at the latest this long after the first request
+        max_queue: Requests allowed to wait (ExecutorBusyError beyond it)
+    """
+
+    def __init__(self, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_us: int = DEFAULT_MAX_WAIT_US, max_queue: int = DEFAULT_MAX_QUEUE):
+        self.max_batch_size = max_batch_size
+        self.max_wait_us = max_wait_us
+        self.max_queue = max_queue
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._dispatches: Set[asyncio.Task] = set()
+
+        self.latency = Histogram()
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+
+    def _ensure_started(self):
+        if self._collector is None or self._collector.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._collector = asyncio.get_running_loop().create_task(self._collect())
+
+    async def predict(self, tonic: float, octave: float, fifth: float) -> Tuple[str, Tuple[float, float, float]]:
+        """
+        Queue one prediction and wait for its batch
+
+        Returns:
+            Tuple[model_name, (L, S, strength)]
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        try:
+            self._queue.put_nowait((tonic, octave, fifth, future))
+        except asyncio.QueueFull:
+            raise ExecutorBusyError(get_inference_executor().retry_after)
+
+        try:
+            return await future
+        finally:
+            self.latency.observe(time.perf_counter() - start)
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        max_wait = self.max_wait_us / 1e6
+        while True:
+            batch: List[_PendingItem] = [await self._queue.get()]
+            deadline = loop.time() + max_wait
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Run the batch concurrently so the next one can start collecting
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[_PendingItem]):
+        self.batch_size.observe(len(batch))
+        inputs = np.array([item[:3] for item in batch], dtype=np.float64)
+        try:
+            model_name, (L, S, strength) = await get_inference_executor().predict_batch(
+                inputs[:, 0], inputs[:, 1], inputs[:, 2]
+            )
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for i, (*_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result((model_name, (float(L[i]), float(S[i]), float(strength[i]))))
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_us": self.max_wait_us,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self.batch_size.snapshot(),
+            "latency_seconds": self.latency.snapshot()
+        }
+
+    async def shutdown(self):
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+
+
+def batching_enabled() -> bool:
+    return os.environ.get(BATCHING_ENV_VAR, "0").lower() in ("1", "true", "yes")
+
+
+_batcher = MicroBatcher(
+    max_batch_size=int(os.environ.get(BATCH_MAX_SIZE_ENV_VAR, DEFAULT_MAX_BATCH_SIZE)),
+    max_wait_us=int(os.environ.get(BATCH_MAX_WAIT_ENV_VAR, DEFAULT_MAX_WAIT_US)),
+    max_queue=int(os.environ.get(BATCH_QUEUE_ENV_VAR, DEFAULT_MAX_QUEUE))
+)
+
+
+def get_micro_batcher() -> MicroBatcher:
+    return _batcher
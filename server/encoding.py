@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Encoding: Content negotiation and fast encoders for bulk responses
+
+Bulk endpoints (/predict/batch, /impact/batch, GET /hit-points) answer
+in the format picked from the Accept header:
+
+- application/vnd.apache.arrow.stream  Arrow IPC stream, one record batch;
+  numeric columns are handed to Arrow without copying
+  (pyarrow.ipc.open_stream(body).read_all())
+- application/msgpack                  map of columns; numeric columns are
+  raw little-endian bytes, their dtypes listed under "__dtypes__"
+  (np.frombuffer(payload[name], dtype))
+- application/json (default)           same document as before, encoded
+  with orjson straight from NumPy arrays
+
+Outputs computed by the server are already well-typed, so every format
+bypasses response_model validation; the response models stay on the
+routes as the documented JSON schema. Scalar metadata (count,
+model_name, next_cursor, ...) travels in the Arrow schema metadata /
+msgpack map and in X-Tuning-Lab-* headers.
+"""
+
+from typing import Dict, Optional, Sequence
+import json
+import numpy as np
+import orjson
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+
+
+JSON = "application/json"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MSGPACK = "application/msgpack"
+
+_MEDIA_TYPES = {
+    JSON: JSON,
+    "application/*": JSON,
+    "*/*": JSON,
+    ARROW_STREAM: ARROW_STREAM,
+    MSGPACK: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+}
+
+BINARY_MEDIA_TYPES = (ARROW_STREAM, MSGPACK)
+
+METADATA_HEADER_PREFIX = "X-Tuning-Lab-"
+
+
+def negotiate(request: Request) -> str:
+    """
+    Response media type for the request's Accept header (JSON when absent)
+
+    Raises:
+        HTTPException(406): None of the accepted types is supported
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return JSON
+
+    candidates = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *params = (p.strip() for p in part.split(";"))
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0 and media_type.lower() in _MEDIA_TYPES:
+            candidates.append((-quality, position, _MEDIA_TYPES[media_type.lower()]))
+
+    if not candidates:
+        raise HTTPException(
+            status_code=406,
+            detail=f"Supported response types: {JSON}, {ARROW_STREAM}, {MSGPACK}"
+        )
+    return min(candidates)[2]
+
+
+def _metadata_headers(metadata: Dict) -> Dict[str, str]:
+    return {
+        f"{METADATA_HEADER_PREFIX}{key.replace('_', '-').title()}": str(value)
+        for key, value in metadata.items() if value is not None
+    }
+
+
+def json_response(content) -> Response:
+    """JSON response encoded with orjson (NumPy arrays serialized natively, no re-validation)"""
+    return Response(
+        orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY),
+        media_type=JSON
+    )
+
+
+def _prepare(values):
+    """Numeric arrays -> contiguous native-endian arrays; everything else -> list"""
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind in "biuf":
+            return np.ascontiguousarray(values, dtype=values.dtype.newbyteorder("="))
+        return values.tolist()
+    return list(values)
+
+
+def _arrow_body(columns: Dict[str, Sequence], metadata: Dict) -> bytes:
+    import pyarrow as pa
+
+    batch = pa.RecordBatch.from_arrays(
+        [pa.array(values) for values in columns.values()],
+        names=list(columns),
+        metadata={"tuning_lab": json.dumps(metadata, ensure_ascii=False)}
+    )
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _msgpack_body(columns: Dict[str, Sequence], metadata: Dict) -> bytes:
+    try:
+        import msgpack
+    except ImportError:
+        raise HTTPException(status_code=406, detail=f"{MSGPACK} responses need the 'msgpack' package")
+
+    payload = dict(metadata)
+    dtypes = {}
+    for name, values in columns.items():
+        if isinstance(values, np.ndarray):
+            array = values.astype(values.dtype.newbyteorder("<"), copy=False)
+            payload[name] = memoryview(array).cast("B")
+            dtypes[name] = array.dtype.str
+        else:
+            payload[name] = values
+    payload["__dtypes__"] = dtypes
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def columnar_response(media_type: str, columns: Dict[str, Sequence],
+                      metadata: Optional[Dict] = None) -> Response:
+    """
+    Encode equal-length columns (NumPy arrays or lists) in the negotiated format
+
+    Args:
+        media_type: Result of negotiate()
+        columns: Column name -> values
+        metadata: Scalar fields of the JSON document (count, model_name, ...)
+    """
+    metadata = metadata or {}
+    columns = {name: _prepare(values) for name, values in columns.items()}
+    if media_type == ARROW_STREAM:
+        body = _arrow_body(columns, metadata)
+    elif media_type == MSGPACK:
+        body = _msgpack_body(columns, metadata)
+    else:
+        return json_response(dict(columns, **metadata))
+    return Response(body, media_type=media_type, headers=_metadata_headers(metadata))
+
+
+def rows_to_columns(rows: Sequence[Dict], names: Sequence[str]) -> Dict[str, list]:
+    """Row dicts -> column lists (in the given column order)"""
+    return {name: [row[name] for row in rows] for name in names}
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Inference Executor: Run model predictions off the asyncio event loop
+
+Modes (TUNING_LAB_EXECUTOR):
+- inline: call the model directly on the event loop (trivial models)
+- thread: thread pool (models that release the GIL, e.g. NumPy/scikit-learn)
+- process: process pool (pure-Python CPU-bound models)
+- auto: follow the active model's execution_hint (default)
+
+Work beyond max_workers + max_queue is rejected with ExecutorBusyError
+so the API can answer 503 + Retry-After instead of queueing unboundedly.
+"""
+
+from typing import Callable, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import os
+import numpy as np
+
+from models.registry import get_model_registry
+from models.prediction_cache import cached_predict
+from config.field_geometry import TonefieldGeometry
+
+
+EXECUTOR_MODE_ENV_VAR = "TUNING_LAB_EXECUTOR"
+EXECUTOR_WORKERS_ENV_VAR = "TUNING_LAB_EXECUTOR_WORKERS"
+EXECUTOR_QUEUE_ENV_VAR = "TUNING_LAB_EXECUTOR_QUEUE"
+EXECUTOR_RETRY_AFTER_ENV_VAR = "TUNING_LAB_RETRY_AFTER"
+
+EXECUTOR_MODES = ("auto", "inline", "thread", "process")
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_QUEUE = 64
+DEFAULT_RETRY_AFTER = 1  # seconds
+
+
+class ExecutorBusyError(Exception):
+    """Raised when the executor queue is full"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Inference queue is full")
+        self.retry_after = retry_after
+
+
+def _activate(model_name: str):
+    """Make a worker process serve the same model as the API process"""
+    registry = get_model_registry()
+    if registry.active_name != model_name:
+        registry.set_active(model_name)
+    return registry.get_active()
+
+
+def _process_predict(model_name: str, tonic: float, octave: float, fifth: float,
+                     geometry: Optional[TonefieldGeometry] = None) -> Tuple[str, Tuple[float, float, float]]:
+    _activate(model_name)
+    model, value = cached_predict(tonic, octave, fifth, geometry)
+    return model.get_model_info()['name'], value
+
+
+def _process_predict_batch(model_name: str, tonic: np.ndarray, octave: np.ndarray,
+                           fifth: np.ndarray) -> Tuple[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    model = _activate(model_name)
+    return model.get_model_info()['name'], model.predict_batch(tonic, octave, fifth)
+
+
+def _thread_predict(tonic: float, octave: float, fifth: float,
+                    geometry: Optional[TonefieldGeometry] = None) -> Tuple[str, Tuple[float, float, float]]:
+    model, value = cached_predict(tonic, octave, fifth, geometry)
+    return model.get_model_info()['name'], value
+
+
+def _thread_predict_batch(tonic: np.ndarray, octave: np.ndarray,
+                          fifth: np.ndarray) -> Tuple[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    model = get_model_registry().get_active()
+    return model.get_model_info()['name'], model.predict_batch(tonic, octave, fifth)
+
+
+class InferenceExecutor:
+    """
+    Bounded dispatcher for model calls
+
+    Args:
+        mode: 'auto', 'inline', 'thread' or 'process'
+        max_workers: Pool size for thread/process modes
+        max_queue: Calls allowed to wait for a free worker
+        retry_after: Retry-After hint (seconds) when the queue is full
+    """
+
+    def __init__(self, mode: str = "auto", max_workers: int = DEFAULT_WORKERS,
+                 max_queue: int = DEFAULT_QUEUE, retry_after: int = DEFAULT_RETRY_AFTER):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode '{mode}' (expected one of {EXECUTOR_MODES})")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        # Only touched from the event loop thread
+        self._pending = 0
+        self.rejected = 0
+
+    def resolve_mode(self) -> str:
+        """Effective mode for the active model"""
+        if self.mode != "auto":
+            return self.mode
+        return getattr(get_model_registry().get_active(), "execution_hint", "thread")
+
+    def _pool(self, mode: str) -> Executor:
+        if mode == "process":
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._process_pool
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="inference"
+            )
+        return self._thread_pool
+
+    async def _submit(self, mode: str, fn: Callable, *args):
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ExecutorBusyError(self.retry_after)
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool(mode), fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def predict(self, tonic: float, octave: float, fifth: float,
+                      geometry: Optional[TonefieldGeometry] = None) -> Tuple[str, Tuple[float, float, float]]:
+        """
+        Cached single prediction with the active model
+
+        Args:
+            geometry: Tonefield geometry of the note (None: model default);
+                passed by value so process workers need no geometry file
+
+        Returns:
+            Tuple[model_name, (L, S, strength)]
+        """
+        mode = self.resolve_mode()
+        if mode == "inline":
+            return _thread_predict(tonic, octave, fifth, geometry)
+        if mode == "process":
+            active = get_model_registry().active_name
+            return await self._submit(mode, _process_predict, active, tonic, octave, fifth, geometry)
+        return await self._submit(mode, _thread_predict, tonic, octave, fifth, geometry)
+
+    async def predict_batch(self, tonic: np.ndarray, octave: np.ndarray,
+                            fifth: np.ndarray) -> Tuple[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Batch prediction with the active model
+
+        Batches never run inline: even a trivial model spends noticeable
+        time on large arrays, so 'inline' falls back to the thread pool.
+        """
+        mode = self.resolve_mode()
+        if mode == "process":
+            active = get_model_registry().active_name
+            return await self._submit(mode, _process_predict_batch, active, tonic, octave, fifth)
+        return await self._submit("thread", _thread_predict_batch, tonic, octave, fifth)
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "effective_mode": self.resolve_mode(),
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self):
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = None
+        self._process_pool = None
+
+
+def _executor_from_env() -> InferenceExecutor:
+    return InferenceExecutor(
+        mode=os.environ.get(EXECUTOR_MODE_ENV_VAR, "auto"),
+        max_workers=int(os.environ.get(EXECUTOR_WORKERS_ENV_VAR, DEFAULT_WORKERS)),
+        max_queue=int(os.environ.get(EXECUTOR_QUEUE_ENV_VAR, DEFAULT_QUEUE)),
+        retry_after=int(os.environ.get(EXECUTOR_RETRY_AFTER_ENV_VAR, DEFAULT_RETRY_AFTER))
+    )
+
+
+_executor = _executor_from_env()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    return _executor
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Metrics: Lightweight in-process histograms for API instrumentation
+"""
+
+from typing import Dict, List, Sequence
+from bisect import bisect_left
+
+
+# Default latency buckets (seconds): 50us ~ 5s
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+# Default batch size buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus 'le' semantics)
+
+    counts[i] holds observations <= bounds[i]; the last slot holds
+    observations above every bound (+Inf).
+    """
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds: List[float] = sorted(bounds)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile (upper bound of the bucket containing it)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.50),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                **{str(b): n for b, n in zip(self.bounds, self.counts)},
+                "+Inf": self.counts[-1]
+            }
+        }
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+OSC Publisher: Rate-controlled prediction feed for TouchDesigner
+
+Predictions are handed to publish() from the API/streaming layer, which
+only stores them as the latest frame (no I/O on the prediction path).
+A separate asyncio task wakes at a fixed frame rate and sends the most
+recent frame as one timestamped OSC bundle, so L, S, strength and force
+arrive together:
+
+    #bundle <prediction time>
+      /tuning/error     tonic octave fifth
+      /tuning/L         L
+      /tuning/S         S
+      /tuning/strength  strength
+      /tuning/force     force
+      /tuning/hit_count hit_count
+      /tuning/frame     seq dropped
+
+Frames older than max_age are dropped instead of sent late, and frames
+replaced before the next tick are coalesced (counted as dropped).
+Force and hit count are computed only for frames that are actually sent.
+
+Enabled with TUNING_LAB_OSC=1 (target: TUNING_LAB_OSC_HOST/PORT,
+default 127.0.0.1:10000, the TouchDesigner OSC In CHOP port).
+"""
+
+from typing import Dict, Optional, Sequence, Union
+import asyncio
+import os
+import time
+import numpy as np
+from pythonosc.osc_bundle import OscBundle
+from pythonosc.osc_bundle_builder import OscBundleBuilder
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+from models.impact_power import solve_impact
+
+
+OSC_ENV_VAR = "TUNING_LAB_OSC"
+OSC_HOST_ENV_VAR = "TUNING_LAB_OSC_HOST"
+OSC_PORT_ENV_VAR = "TUNING_LAB_OSC_PORT"
+OSC_FPS_ENV_VAR = "TUNING_LAB_OSC_FPS"
+OSC_MAX_AGE_ENV_VAR = "TUNING_LAB_OSC_MAX_AGE_MS"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 10000
+DEFAULT_FPS = 60.0
+DEFAULT_MAX_AGE_MS = 250.0
+DEFAULT_PREFIX = "/tuning"
+
+OscValue = Union[float, int, str]
+
+
+def build_bundle(values: Dict[str, Union[OscValue, Sequence[OscValue]]], timestamp: float) -> OscBundle:
+    """Build one OSC bundle from {address: value or list of values}"""
+    bundle = OscBundleBuilder(timestamp)
+    for address, value in values.items():
+        message = OscMessageBuilder(address=address)
+        for arg in (value if isinstance(value, (list, tuple)) else (value,)):
+            message.add_arg(arg)
+        bundle.add_content(message.build())
+    return bundle.build()
+
+
+class _Frame:
+    """Latest published prediction"""
+    __slots__ = ('inputs', 'outputs', 'timestamp')
+
+    def __init__(self, inputs, outputs, timestamp: float):
+        self.inputs = inputs    # (tonic, octave, fifth)
+        self.outputs = outputs  # (L, S, strength)
+        self.timestamp = timestamp
+
+
+class _Protocol(asyncio.DatagramProtocol):
+    def error_received(self, exc):
+        pass  # receiver not listening (ICMP port unreachable); keep sending
+
+
+class OscPublisher:
+    """
+    Latest-frame OSC publisher running on its own asyncio task
+
+    Args:
+        host, port: OSC receiver
+        fps: Frames sent per second at most
+        max_age_ms: Frames older than this at send time are dropped
+        prefix: OSC address prefix
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, fps: float = DEFAULT_FPS,
+                 max_age_ms: float = DEFAULT_MAX_AGE_MS, prefix: str = DEFAULT_PREFIX):
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.host = host
+        self.port = port
+        self.fps = fps
+        self.max_age = max_age_ms / 1000.0
+        self.prefix = prefix.rstrip('/')
+
+        self._pending: Optional[_Frame] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.seq = 0
+        self.published = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.stale = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def publish(self, tonic: float, octave: float, fifth: float, L: float, S: float, strength: float):
+        """Offer a prediction for the next frame (never blocks; no-op when stopped)"""
+        if self._task is None:
+            return
+        if self._pending is not None:
+            self.coalesced += 1
+        self._pending = _Frame(
+            (float(tonic), float(octave), float(fifth)),
+            (float(L), float(S), float(strength)),
+            time.time()
+        )
+        self.published += 1
+
+    def _encode(self, frame: _Frame) -> bytes:
+        tonic, octave, fifth = frame.inputs
+        _, impact = solve_impact(np.array([tonic]), np.array([octave]), np.array([fifth]))
+        L, S, strength = frame.outputs
+        p = self.prefix
+        return build_bundle({
+            f"{p}/error": [tonic, octave, fifth],
+            f"{p}/L": L,
+            f"{p}/S": S,
+            f"{p}/strength": strength,
+            f"{p}/force": float(impact.force[0]),
+            f"{p}/hit_count": int(impact.count[0]),
+            f"{p}/frame": [self.seq, self.coalesced + self.stale],
+        }, frame.timestamp).dgram
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.fps
+        next_tick = loop.time()
+        while True:
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick = loop.time()  # fell behind: skip ticks instead of bursting
+            else:
+                await asyncio.sleep(delay)
+
+            frame, self._pending = self._pending, None
+            if frame is None:
+                continue
+            if time.time() - frame.timestamp > self.max_age:
+                self.stale += 1
+                continue
+            self.seq += 1
+            self._transport.sendto(self._encode(frame))
+            self.sent += 1
+
+    async def start(self):
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            _Protocol, remote_addr=(self.host, self.port)
+        )
+        self._task = loop.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        self._pending = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "target": f"{self.host}:{self.port}",
+            "fps": self.fps,
+            "max_age_ms": self.max_age * 1000.0,
+            "published": self.published,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "stale": self.stale
+        }
+
+
+def osc_enabled() -> bool:
+    return os.environ.get(OSC_ENV_VAR, "0").lower() in ("1", "true", "yes")
+
+
+_publisher = OscPublisher(
+    host=os.environ.get(OSC_HOST_ENV_VAR, DEFAULT_HOST),
+    port=int(os.environ.get(OSC_PORT_ENV_VAR, DEFAULT_PORT)),
+    fps=float(os.environ.get(OSC_FPS_ENV_VAR, DEFAULT_FPS)),
+    max_age_ms=float(os.environ.get(OSC_MAX_AGE_ENV_VAR, DEFAULT_MAX_AGE_MS))
+)
+
+
+def get_osc_publisher() -> OscPublisher:
+    return _publisher
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Profiling: On-demand request profiler for production debugging
+
+Off by default; switched on and tuned at runtime (PUT /admin/profiler).
+While on, ProfilingMiddleware captures:
+
+- a sample_rate fraction of requests: cProfile of the event loop thread
+  (.pstats) plus stack samples of every thread (.collapsed)
+- every request slower than slow_ms: stack samples (.collapsed)
+
+Stack samples come from one background thread that reads
+sys._current_frames() every interval_ms while at least one request is
+being watched, so inference running in executor threads is covered
+too. Files use the collapsed-stack format of flamegraph.pl/speedscope
+("thread;frame;frame count").
+
+Both profilers see everything the process runs while a request is in
+flight, including interleaved requests on the same event loop. Only
+one cProfile runs at a time; sampled requests that find it busy get
+stack samples only.
+
+Files go to TUNING_LAB_PROFILE_DIR (default: data/profiles); only the
+newest max_files are kept. When the profiler is off the middleware
+passes requests straight through.
+"""
+
+from typing import Counter as CounterType, Dict, List, Optional, Set
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+import asyncio
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+
+PROFILE_DIR_ENV_VAR = "TUNING_LAB_PROFILE_DIR"
+PROFILE_KEEP_ENV_VAR = "TUNING_LAB_PROFILE_KEEP"
+
+DEFAULT_PROFILE_DIR = Path(__file__).parent.parent / "data" / "profiles"
+DEFAULT_MAX_FILES = 200
+DEFAULT_INTERVAL_MS = 1.0
+MAX_STACK_DEPTH = 128
+
+PROFILE_NAME = re.compile(r"^[\w.\-]+\.(pstats|collapsed)$")
+_UNSAFE_PATH_CHARS = re.compile(r"[^\w\-]+")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}:{code.co_name}:{frame.f_lineno}"
+
+
+def collapse_stack(frame, thread_name: str) -> str:
+    """Root-first 'thread;module:function:line;...' for one thread's current frame"""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Background thread sampling all thread stacks into attached counters"""
+
+    def __init__(self, interval_ms: float = DEFAULT_INTERVAL_MS):
+        self.interval = interval_ms / 1000.0
+        self._collectors: Set[int] = set()
+        self._counters: Dict[int, CounterType[str]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.samples = 0
+
+    def attach(self) -> CounterType[str]:
+        """Start collecting samples into a new counter"""
+        counter: CounterType[str] = Counter()
+        with self._lock:
+            self._counters[id(counter)] = counter
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return counter
+
+    def detach(self, counter: CounterType[str]):
+        with self._lock:
+            self._counters.pop(id(counter), None)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.is_set():
+            with self._lock:
+                counters = list(self._counters.values())
+            if not counters:
+                self._wake.clear()
+                self._wake.wait(0.5)
+                continue
+
+            names = {t.ident: t.name for t in threading.enumerate()}
+            stacks = [
+                collapse_stack(frame, names.get(ident, str(ident)))
+                for ident, frame in sys._current_frames().items() if ident != own
+            ]
+            for counter in counters:
+                counter.update(stacks)
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+class RequestProfiler:
+    """
+    Runtime profiler settings, capture and rotating profile directory
+
+    Args:
+        directory: Where profiles are written
+        max_files: Newest files kept (older ones are deleted)
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_files: int = DEFAULT_MAX_FILES):
+        self.directory = Path(directory or os.environ.get(PROFILE_DIR_ENV_VAR, DEFAULT_PROFILE_DIR))
+        self.max_files = max_files
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.slow_ms: Optional[float] = None
+        self.sampler = StackSampler()
+
+        self._cprofile_busy = False  # only touched from the event loop thread
+        self.captured = 0
+        self.skipped_cprofile = 0
+
+    def configure(self, enabled: bool, sample_rate: float = 0.0, slow_ms: Optional[float] = None,
+                  interval_ms: Optional[float] = None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be within 0.0 ~ 1.0")
+        if interval_ms is not None:
+            self.sampler.interval = interval_ms / 1000.0
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.enabled = enabled
+        if not enabled:
+            self.sampler.stop()
+
+    def settings(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "slow_ms": self.slow_ms,
+            "interval_ms": self.sampler.interval * 1000.0,
+            "directory": str(self.directory),
+            "max_files": self.max_files,
+            "captured": self.captured,
+            "skipped_cprofile": self.skipped_cprofile,
+            "stack_samples": self.sampler.samples
+        }
+
+    def _write(self, route: str, elapsed: float, reason: str,
+               stacks: Optional[CounterType[str]], profile: Optional[cProfile.Profile]) -> List[str]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        slug = _UNSAFE_PATH_CHARS.sub("_", route).strip("_") or "root"
+        base = f"{stamp}-{slug}-{elapsed * 1000:.1f}ms-{reason}"
+
+        written = []
+        if profile is not None:
+            profile.dump_stats(self.directory / f"{base}.pstats")
+            written.append(f"{base}.pstats")
+        if stacks:
+            text = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+            (self.directory / f"{base}.collapsed").write_text(text, encoding="utf-8")
+            written.append(f"{base}.collapsed")
+        self._rotate()
+        return written
+
+    def _rotate(self):
+        files = sorted(self.directory.iterdir(), key=lambda p: p.stat().st_mtime)
+        files = [p for p in files if PROFILE_NAME.match(p.name)]
+        for path in files[:max(len(files) - self.max_files, 0)]:
+            path.unlink(missing_ok=True)
+
+    def list_profiles(self) -> List[dict]:
+        """Stored profiles, newest first"""
+        if not self.directory.is_dir():
+            return []
+        entries = []
+        for path in self.directory.iterdir():
+            if PROFILE_NAME.match(path.name):
+                stat = path.stat()
+                entries.append({
+                    "name": path.name,
+                    "format": path.suffix[1:],
+                    "size": stat.st_size,
+                    "modified": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(timespec="seconds")
+                })
+        return sorted(entries, key=lambda e: e["name"], reverse=True)
+
+    def profile_path(self, name: str) -> Optional[Path]:
+        """Path of a stored profile (None for unknown or unsafe names)"""
+        if not PROFILE_NAME.match(name):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware applying the RequestProfiler to HTTP requests"""
+
+    def __init__(self, app, profiler: Optional[RequestProfiler] = None, exclude_prefix: str = "/admin/"):
+        self.app = app
+        self.profiler = profiler or get_request_profiler()
+        self.exclude_prefix = exclude_prefix
+
+    async def __call__(self, scope, receive, send):
+        profiler = self.profiler
+        if not profiler.enabled or scope["type"] != "http" or scope["path"].startswith(self.exclude_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        sampled = profiler.sample_rate > 0.0 and random.random() < profiler.sample_rate
+        slow_ms = profiler.slow_ms
+        if not sampled and slow_ms is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = None
+        if sampled:
+            if profiler._cprofile_busy:
+                profiler.skipped_cprofile += 1
+            else:
+                profiler._cprofile_busy = True
+                profile = cProfile.Profile()
+                profile.enable()
+        stacks = profiler.sampler.attach()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                profiler._cprofile_busy = False
+            profiler.sampler.detach(stacks)
+
+            slow = slow_ms is not None and elapsed * 1000.0 >= slow_ms
+            if sampled or slow:
+                profiler.captured += 1
+                route = scope.get("route")
+                await asyncio.to_thread(
+                    profiler._write, getattr(route, "path", scope["path"]), elapsed,
+                    "slow" if slow else "sampled", stacks, profile
+                )
+
+
+_profiler = RequestProfiler(max_files=int(os.environ.get(PROFILE_KEEP_ENV_VAR, DEFAULT_MAX_FILES)))
+
+
+def get_request_profiler() -> RequestProfiler:
+    return _profiler
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming: WebSocket prediction feed for live tuning-error readings
+
+Frame formats (response uses the same format as the request):
+- JSON text: {"tonic": t, "octave": o, "fifth": f} (optional "seq" is echoed)
+  or a list of [t, o, f] triples
+- Binary: packed little-endian float32 (tonic, octave, fifth) triples,
+  answered with packed float32 (L, S, strength) triples
+
+Each connection keeps a small bounded frame queue. When the client
+sends faster than predictions are delivered the oldest frames are
+dropped, so a slow client never builds an unbounded backlog.
+"""
+
+from typing import Deque, Optional, Tuple
+from collections import deque
+import asyncio
+import json
+import os
+import numpy as np
+from fastapi import WebSocket, WebSocketDisconnect
+
+from server.executor import ExecutorBusyError, get_inference_executor
+from server.osc_publisher import get_osc_publisher
+
+
+WS_QUEUE_ENV_VAR = "TUNING_LAB_WS_QUEUE"
+DEFAULT_WS_QUEUE = 8
+
+INPUT_MIN, INPUT_MAX = -50.0, 50.0
+FRAME_DTYPE = np.dtype('<f4')
+
+
+class FrameError(ValueError):
+    """Malformed or out-of-range frame"""
+
+
+class _Frame:
+    """Decoded request frame"""
+    __slots__ = ('inputs', 'binary', 'single', 'seq')
+
+    def __init__(self, inputs: np.ndarray, binary: bool, single: bool = False, seq=None):
+        self.inputs = inputs  # shape (n, 3): tonic, octave, fifth
+        self.binary = binary
+        self.single = single
+        self.seq = seq
+
+
+def decode_frame(message: dict) -> _Frame:
+    """Decode a raw ASGI websocket.receive message"""
+    if message.get('bytes') is not None:
+        data = message['bytes']
+        if len(data) == 0 or len(data) % (3 * FRAME_DTYPE.itemsize):
+            raise FrameError("Binary frame length must be a multiple of 12 bytes")
+        inputs = np.frombuffer(data, dtype=FRAME_DTYPE).reshape(-1, 3).astype(np.float64)
+        frame = _Frame(inputs, binary=True)
+    else:
+        try:
+            payload = json.loads(message.get('text') or '')
+            if isinstance(payload, dict):
+                triple = [payload['tonic'], payload['octave'], payload['fifth']]
+                frame = _Frame(np.array([triple], dtype=np.float64), binary=False,
+                               single=True, seq=payload.get('seq'))
+            else:
+                frame = _Frame(np.array(payload, dtype=np.float64).reshape(-1, 3), binary=False)
+        except (ValueError, KeyError, TypeError) as e:
+            raise FrameError(f"Invalid JSON frame: {e}")
+
+    inputs = frame.inputs
+    if inputs.size == 0:
+        raise FrameError("Frame contains no readings")
+    if not np.all(np.isfinite(inputs)) or inputs.min() < INPUT_MIN or inputs.max() > INPUT_MAX:
+        raise FrameError(f"Tuning errors must be within {INPUT_MIN} ~ {INPUT_MAX} cents")
+    return frame
+
+
+def encode_frame(frame: _Frame, outputs: np.ndarray, model_name: str, dropped: int):
+    """Encode (n, 3) outputs for the frame's format: bytes or JSON-ready dict"""
+    if frame.binary:
+        return np.ascontiguousarray(outputs, dtype=FRAME_DTYPE).tobytes()
+    if frame.single:
+        L, S, strength = outputs[0].tolist()
+        response = {"L": L, "S": S, "strength": strength}
+        if frame.seq is not None:
+            response["seq"] = frame.seq
+    else:
+        response = {"L": outputs[:, 0].tolist(), "S": outputs[:, 1].tolist(),
+                    "strength": outputs[:, 2].tolist()}
+    response["model_name"] = model_name
+    response["dropped"] = dropped
+    return response
+
+
+class PredictionStream:
+    """One WebSocket connection: receiver task + predict/send loop"""
+
+    def __init__(self, websocket: WebSocket, max_queue: int = DEFAULT_WS_QUEUE):
+        self.websocket = websocket
+        self.frames: Deque[_Frame] = deque(maxlen=max_queue)
+        self.ready = asyncio.Event()
+        self.closed = False
+        self.dropped = 0
+
+    async def _receive(self):
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message['type'] == 'websocket.disconnect':
+                    break
+                try:
+                    frame = decode_frame(message)
+                except FrameError as e:
+                    await self.websocket.send_json({"error": str(e)})
+                    continue
+                if len(self.frames) == self.frames.maxlen:
+                    self.dropped += 1  # deque drops the oldest frame
+                self.frames.append(frame)
+                self.ready.set()
+        finally:
+            self.closed = True
+            self.ready.set()
+
+    async def _next_frames(self) -> Optional[Tuple[_Frame, ...]]:
+        while not self.frames:
+            if self.closed:
+                return None
+            self.ready.clear()
+            await self.ready.wait()
+        frames = tuple(self.frames)
+        self.frames.clear()
+        return frames
+
+    async def run(self):
+        receiver = asyncio.create_task(self._receive())
+        executor = get_inference_executor()
+        try:
+            while True:
+                frames = await self._next_frames()
+                if frames is None:
+                    break
+
+                # One vectorized model call for everything queued
+                inputs = np.concatenate([f.inputs for f in frames])
+                try:
+                    model_name, (L, S, strength) = await executor.predict_batch(
+                        inputs[:, 0], inputs[:, 1], inputs[:, 2]
+                    )
+                except ExecutorBusyError as e:
+                    self.dropped += len(frames)
+                    await self.websocket.send_json({"error": str(e), "retry_after": e.retry_after})
+                    continue
+                outputs = np.stack([L, S, strength], axis=1)
+                get_osc_publisher().publish(*inputs[-1], *outputs[-1])
+
+                offset = 0
+                for frame in frames:
+                    n = frame.inputs.shape[0]
+                    payload = encode_frame(frame, outputs[offset:offset + n], model_name, self.dropped)
+                    offset += n
+                    if isinstance(payload, bytes):
+                        await self.websocket.send_bytes(payload)
+                    else:
+                        await self.websocket.send_json(payload)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            receiver.cancel()
+
+
+async def serve_prediction_stream(websocket: WebSocket):
+    await websocket.accept()
+    max_queue = int(os.environ.get(WS_QUEUE_ENV_VAR, DEFAULT_WS_QUEUE))
+    await PredictionStream(websocket, max_queue).run()
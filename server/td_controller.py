@@ -1,5 +1,29 @@
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import BaseModel, Field
 from pythonosc import udp_client
+from typing import List, Optional
+from pathlib import Path
+import asyncio
+import json
+import sys
+import time
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from server.osc_publisher import build_bundle
+from config.field_geometry import get_geometry_config
+from models.hit_model import get_active_model
+from models.registry import get_model_registry
+from models.prediction_cache import get_prediction_cache
+from models.impact_power import HAMMERING_TYPE_NAMES, solve_impact
+from models.instrument_plan import DEFAULT_TOLERANCE, NoteErrors, plan_instrument
+from storage.hit_points_repository import get_hit_points_repository
+
+# 계산 도구는 HTTP(server/api.py)를 거치지 않고 이 프로세스에 한 번 로드된
+# 모델과 예측 캐시를 그대로 사용합니다.
+SCORE_CHUNK_SIZE = 256  # 이 개수마다 진행 상황과 부분 결과를 보냅니다
 
 # 1. MCP 서버 생성 (이름은 마음대로 지어도 됩니다)
 mcp = FastMCP("TouchDesigner Controller")
@@ -19,20 +43,125 @@ def set_tuning_simulation(error_level: float, force_intensity: float) -> str:
         force_intensity: 타격 강도 (0.0 ~ 5.0). 높을수록 세게 침.
     """
     
-    # 터치디자이너로 OSC 메시지 전송
-    # 주소: /simulation/error, 값: error_level
-    td_client.send_message("/simulation/error", error_level)
-    td_client.send_message("/simulation/force", force_intensity)
+    # 터치디자이너로 OSC 번들 전송 (오차와 강도가 한 번에 도착)
+    # 주소: /simulation/error, /simulation/force
+    td_client.send(build_bundle({
+        "/simulation/error": error_level,
+        "/simulation/force": force_intensity
+    }, time.time()))
     
     return f"TouchDesigner 전송 완료: 오차={error_level}, 강도={force_intensity}"
 
 @mcp.tool()
 def reset_simulation() -> str:
     """시뮬레이션을 초기화합니다 (오차 0, 강도 0)."""
-    td_client.send_message("/simulation/error", 0.0)
-    td_client.send_message("/simulation/force", 0.0)
+    td_client.send(build_bundle({"/simulation/error": 0.0, "/simulation/force": 0.0}, time.time()))
     return "시뮬레이션 리셋 완료."
 
+class NoteErrorInput(BaseModel):
+    """음 하나의 튜닝 오차 (단위: cents)"""
+    note: str = Field("", description="음 이름 (예: D3). 악기 지오메트리가 있으면 사용")
+    tonic: float = Field(..., ge=-50.0, le=50.0)
+    octave: float = Field(..., ge=-50.0, le=50.0)
+    fifth: float = Field(..., ge=-50.0, le=50.0)
+
+
+def _score_chunk(entries: List[NoteErrorInput]) -> List[dict]:
+    """모델(캐시 경유) 예측 + 타격 좌표/강도/횟수 계산"""
+    model = get_active_model()
+    info = model.get_model_info()
+    cache = get_prediction_cache()
+    geometry_config = get_geometry_config()
+
+    predictions = [
+        cache.predict(
+            model, e.tonic, e.octave, e.fifth, model_info=info,
+            geometry=geometry_config.get_geometry(e.note) if geometry_config.has_geometry(e.note) else None
+        )
+        for e in entries
+    ]
+    errors = np.array([[e.tonic, e.octave, e.fifth] for e in entries], dtype=np.float64)
+    solution, impact = solve_impact(errors[:, 0], errors[:, 1], errors[:, 2])
+
+    return [
+        {
+            "note": e.note or None,
+            "L": L, "S": S, "strength": strength,
+            "coordinate_x": float(solution.x[i]),
+            "coordinate_y": float(solution.y[i]),
+            "force": float(impact.force[i]),
+            "hit_count": int(impact.count[i]),
+            "hammering_type": HAMMERING_TYPE_NAMES[impact.hammering_type[i]],
+        }
+        for i, (e, (L, S, strength)) in enumerate(zip(entries, predictions))
+    ]
+
+
+@mcp.tool()
+async def score_notes(notes: List[NoteErrorInput], ctx: Context) -> dict:
+    """
+    여러 음의 튜닝 오차를 한 번에 채점합니다 (타격 위치, 강도, 타격 횟수, 타법).
+
+    SCORE_CHUNK_SIZE 개마다 진행 상황과 부분 결과를 스트리밍하므로
+    수천 개 지점의 스윕도 도구 호출 한 번으로 처리할 수 있습니다.
+
+    Args:
+        notes: 음별 오차 목록 [{note, tonic, octave, fifth}, ...]
+    """
+    results: List[dict] = []
+    for start in range(0, len(notes), SCORE_CHUNK_SIZE):
+        chunk = await asyncio.to_thread(_score_chunk, notes[start:start + SCORE_CHUNK_SIZE])
+        results.extend(chunk)
+        await ctx.report_progress(len(results), len(notes))
+        if len(notes) > SCORE_CHUNK_SIZE:
+            await ctx.info(f"채점 {len(results)}/{len(notes)}: {json.dumps(chunk, ensure_ascii=False)}")
+
+    return {
+        "model_name": get_active_model().get_model_info()['name'],
+        "count": len(results),
+        "results": results,
+        "cache": get_prediction_cache().stats()
+    }
+
+
+@mcp.tool()
+async def instrument_plan(notes: List[NoteErrorInput], ctx: Context,
+                          tolerance: float = DEFAULT_TOLERANCE) -> dict:
+    """
+    악기 전체(모든 음)의 해머링 계획을 세웁니다. 기대 오차 감소량이 큰 음부터 정렬됩니다.
+
+    Args:
+        notes: 음별 오차 목록 [{note, tonic, octave, fifth}, ...]
+        tolerance: 모든 |오차|가 이 값 이하인 음은 조율된 것으로 보고 제외
+    """
+    await ctx.report_progress(0, len(notes))
+    plan = await asyncio.to_thread(
+        plan_instrument,
+        [NoteErrors(e.note, e.tonic, e.octave, e.fifth) for e in notes],
+        tolerance=tolerance
+    )
+    await ctx.report_progress(len(notes), len(notes))
+    return plan._asdict()
+
+
+@mcp.tool()
+def recent_history(limit: int = 20, note: Optional[str] = None, cursor: Optional[str] = None) -> dict:
+    """
+    저장된 타격 기록(hit_points)을 최신순으로 조회합니다.
+
+    Args:
+        limit: 가져올 개수 (1 ~ 500)
+        note: 음 이름으로 필터 (예: D3)
+        cursor: 이전 결과의 next_cursor (다음 페이지)
+    """
+    rows, next_cursor = get_hit_points_repository().page(
+        limit=max(1, min(limit, 500)), cursor=cursor, note=note
+    )
+    return {"items": rows, "next_cursor": next_cursor}
+
+
 # 서버 실행 (이 부분이 없으면 실행하자마자 꺼집니다!)
 if __name__ == "__main__":
+    # 모델을 미리 로드해 첫 도구 호출이 느리지 않도록 함
+    get_model_registry().warm_up()
     mcp.run()
\ No newline at end of file
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Experiment Store: Append-only columnar storage for tuning experiments
+
+Appends go to a JSON-lines write-ahead log (cheap, one line per sample).
+compact() moves the log into Parquet files partitioned by date/note;
+scan() reads selected columns and date ranges from both.
+
+Layout:
+    <root>/wal/current.jsonl
+    <root>/parquet/date=YYYY-MM-DD/note=<note>/<uuid>.parquet
+"""
+
+from typing import Iterable, List, Optional, Sequence, Union
+from datetime import date, datetime, timezone
+from pathlib import Path
+import json
+import os
+import threading
+import uuid
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+
+EXPERIMENT_DIR_ENV_VAR = "TUNING_LAB_EXPERIMENT_DIR"
+DEFAULT_EXPERIMENT_DIR = Path(__file__).parent.parent / "data" / "experiments"
+DEFAULT_NOTE = "default"
+
+SCHEMA = pa.schema([
+    ("timestamp", pa.timestamp("us", tz="UTC")),
+    ("note", pa.string()),
+    ("tonic", pa.float64()),
+    ("octave", pa.float64()),
+    ("fifth", pa.float64()),
+    ("L", pa.float64()),
+    ("S", pa.float64()),
+    ("strength", pa.float64()),
+    ("model_name", pa.string()),
+    ("model_version", pa.string()),
+])
+PARTITIONING = ds.partitioning(
+    pa.schema([("date", pa.string()), ("note", pa.string())]), flavor="hive"
+)
+
+
+def _parse_timestamp(value) -> datetime:
+    if isinstance(value, datetime):
+        ts = value
+    elif value is None:
+        ts = datetime.now(timezone.utc)
+    else:
+        ts = datetime.fromisoformat(str(value))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def normalize_sample(sample: dict) -> dict:
+    """
+    Flatten a sample into a store row
+
+    Accepts flat rows or the samples.json format
+    ({"timestamp", "input": {...}, "output": {...}}).
+    """
+    inputs = sample.get("input", sample)
+    outputs = sample.get("output", sample)
+    return {
+        "timestamp": _parse_timestamp(sample.get("timestamp")).isoformat(),
+        "note": sample.get("note") or sample.get("note_name") or inputs.get("note_name") or DEFAULT_NOTE,
+        "tonic": float(inputs["tonic"]),
+        "octave": float(inputs["octave"]),
+        "fifth": float(inputs["fifth"]),
+        "L": float(outputs["L"]) if outputs.get("L") is not None else None,
+        "S": float(outputs["S"]) if outputs.get("S") is not None else None,
+        "strength": float(outputs["strength"]) if outputs.get("strength") is not None else None,
+        "model_name": sample.get("model_name"),
+        "model_version": sample.get("model_version"),
+    }
+
+
+def _rows_to_table(rows: List[dict]) -> pa.Table:
+    columns = {name: [row.get(name) for row in rows] for name in SCHEMA.names}
+    columns["timestamp"] = [_parse_timestamp(ts) for ts in columns["timestamp"]]
+    return pa.Table.from_pydict(columns, schema=SCHEMA)
+
+
+class ExperimentStore:
+    """
+    Write-ahead log + partitioned Parquet experiment store
+
+    Args:
+        root: Store directory
+        compact_threshold: Compact automatically once the log holds this
+            many rows (None: only on explicit compact())
+    """
+
+    def __init__(self, root: Optional[Path] = None, compact_threshold: Optional[int] = 10000):
+        self.root = Path(root or os.environ.get(EXPERIMENT_DIR_ENV_VAR, DEFAULT_EXPERIMENT_DIR))
+        self.wal_dir = self.root / "wal"
+        self.parquet_dir = self.root / "parquet"
+        self.wal_path = self.wal_dir / "current.jsonl"
+        self.compact_threshold = compact_threshold
+
+        self.wal_dir.mkdir(parents=True, exist_ok=True)
+        self.parquet_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._wal_rows = self._count_lines(self.wal_path)
+
+    @staticmethod
+    def _count_lines(path: Path) -> int:
+        if not path.exists():
+            return 0
+        with open(path, "rb") as f:
+            return sum(1 for _ in f)
+
+    def append(self, samples: Union[dict, Iterable[dict]]) -> int:
+        """Append one sample or many samples to the log; returns rows written"""
+        if isinstance(samples, dict):
+            samples = [samples]
+        lines = [json.dumps(normalize_sample(s), ensure_ascii=False) + "\n" for s in samples]
+        if not lines:
+            return 0
+
+        with self._lock:
+            with open(self.wal_path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self._wal_rows += len(lines)
+            should_compact = self.compact_threshold is not None and self._wal_rows >= self.compact_threshold
+
+        if should_compact:
+            self.compact()
+        return len(lines)
+
+    def _read_wal(self, paths: Sequence[Path]) -> List[dict]:
+        rows = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                rows.extend(json.loads(line) for line in f if line.strip())
+        return rows
+
+    def compact(self) -> int:
+        """
+        Move logged rows into Parquet; returns rows compacted
+
+        The log is renamed before writing so appends continue into a
+        fresh file; a leftover '*.compacting' log from an interrupted
+        run is picked up by the next compaction.
+        """
+        with self._lock:
+            if self.wal_path.exists() and self._wal_rows:
+                self.wal_path.rename(self.wal_dir / f"{uuid.uuid4().hex}.compacting")
+            self._wal_rows = 0
+            pending = sorted(self.wal_dir.glob("*.compacting"))
+
+            rows = self._read_wal(pending)
+            if rows:
+                table = _rows_to_table(rows)
+                dates = pc.strftime(table["timestamp"], format="%Y-%m-%d")
+                table = table.append_column("date", dates)
+                ds.write_dataset(
+                    table,
+                    self.parquet_dir,
+                    format="parquet",
+                    partitioning=PARTITIONING,
+                    basename_template=f"{uuid.uuid4().hex}-{{i}}.parquet",
+                    existing_data_behavior="overwrite_or_ignore",
+                )
+            for path in pending:
+                path.unlink()
+            return len(rows)
+
+    def _dataset(self) -> Optional[ds.Dataset]:
+        if not any(self.parquet_dir.rglob("*.parquet")):
+            return None
+        return ds.dataset(self.parquet_dir, format="parquet", partitioning=PARTITIONING)
+
+    def scan(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[Union[date, datetime]] = None,
+        end: Optional[Union[date, datetime]] = None,
+        notes: Optional[Sequence[str]] = None,
+    ) -> pa.Table:
+        """
+        Read selected columns for a time range (start inclusive, end exclusive)
+
+        Date partitions outside the range are skipped without being
+        opened; rows not yet compacted are read from the log.
+        """
+        columns = list(columns or SCHEMA.names)
+        start_ts = _parse_timestamp(start.isoformat() if isinstance(start, date) else start) if start else None
+        end_ts = _parse_timestamp(end.isoformat() if isinstance(end, date) else end) if end else None
+
+        filters = []
+        if start_ts is not None:
+            filters.append(ds.field("date") >= start_ts.strftime("%Y-%m-%d"))
+            filters.append(ds.field("timestamp") >= pa.scalar(start_ts, SCHEMA.field("timestamp").type))
+        if end_ts is not None:
+            filters.append(ds.field("date") <= end_ts.strftime("%Y-%m-%d"))
+            filters.append(ds.field("timestamp") < pa.scalar(end_ts, SCHEMA.field("timestamp").type))
+        if notes:
+            filters.append(ds.field("note").isin(list(notes)))
+        expression = None
+        for f in filters:
+            expression = f if expression is None else expression & f
+
+        tables = []
+        dataset = self._dataset()
+        if dataset is not None:
+            tables.append(dataset.to_table(columns=columns, filter=expression))
+
+        with self._lock:
+            wal_paths = sorted(self.wal_dir.glob("*.compacting")) + (
+                [self.wal_path] if self.wal_path.exists() else []
+            )
+            wal_rows = self._read_wal(wal_paths)
+        if wal_rows:
+            wal = _rows_to_table(wal_rows)
+            if expression is not None:
+                wal = wal.append_column("date", pc.strftime(wal["timestamp"], format="%Y-%m-%d"))
+                wal = wal.filter(expression)
+            tables.append(wal.select(columns))
+
+        if not tables:
+            return SCHEMA.empty_table().select(columns)
+        return pa.concat_tables(tables, promote_options="permissive").select(columns)
+
+    def count(self) -> int:
+        return self.scan(columns=["timestamp"]).num_rows
+
+
+def import_samples_json(path: Path, store: Optional["ExperimentStore"] = None) -> int:
+    """One-time import of the legacy data/samples.json format; returns rows imported"""
+    store = store or get_experiment_store()
+    # Legacy file may contain non-UTF-8 bytes in its description text
+    data = json.loads(Path(path).read_bytes().decode("utf-8", errors="replace"))
+    written = store.append(data.get("samples", []))
+    store.compact()
+    return written
+
+
+_store: Optional[ExperimentStore] = None
+_store_lock = threading.Lock()
+
+
+def get_experiment_store() -> ExperimentStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ExperimentStore()
+    return _store
+
+
+if __name__ == "__main__":
+    # Usage: python -m storage.experiment_store [samples.json]
+    import sys
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent.parent / "data" / "samples.json"
+    print(f"Imported {import_samples_json(source)} samples from {source}")
+    print(f"Store: {get_experiment_store().root} ({get_experiment_store().count()} rows)")
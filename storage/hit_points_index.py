@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Hit Points Index: Nearest-neighbour lookup of similar past hits
+
+KD-tree (scipy cKDTree) over the (tonic, octave, fifth) errors of the
+stored hit points. New rows are picked up incrementally: they land in a
+small delta buffer that is scanned linearly, and the tree is rebuilt
+once the buffer outgrows a fraction of the tree. The tree is persisted
+with the rowid watermark it covers, so startup only reads newer rows.
+
+Layout:
+    <dir>/tree.pkl    (cKDTree, pickled with its node arrays)
+    <dir>/rowids.npy  (hit_points rowid per tree point)
+    <dir>/meta.json   (watermark, point count)
+"""
+
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+import json
+import os
+import pickle
+import threading
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from storage.hit_points_repository import HitPointsRepository, get_hit_points_repository
+
+
+INDEX_DIR_ENV_VAR = "TUNING_LAB_INDEX_DIR"
+DEFAULT_INDEX_DIR = Path(__file__).parent.parent / "data" / "hit_points_index"
+MAX_NEIGHBOURS = 50
+
+
+class HitPointIndex:
+    """
+    Incrementally maintained KD-tree over stored hit points
+
+    Args:
+        repository: Hit points source
+        path: Persistence directory
+        rebuild_fraction: Rebuild once the delta buffer exceeds this
+            fraction of the tree size
+        min_rebuild: ... or this many rows, whichever is larger
+    """
+
+    def __init__(
+        self,
+        repository: Optional[HitPointsRepository] = None,
+        path: Optional[Path] = None,
+        rebuild_fraction: float = 0.1,
+        min_rebuild: int = 1024,
+    ):
+        self.repository = repository or get_hit_points_repository()
+        self.path = Path(path or os.environ.get(INDEX_DIR_ENV_VAR, DEFAULT_INDEX_DIR))
+        self.rebuild_fraction = rebuild_fraction
+        self.min_rebuild = min_rebuild
+
+        self._lock = threading.Lock()
+        self._tree: Optional[cKDTree] = None
+        self._tree_rowids = np.empty(0, dtype=np.int64)
+        self._tree_watermark = 0
+        self._delta_points = np.empty((0, 3), dtype=np.float64)
+        self._delta_rowids = np.empty(0, dtype=np.int64)
+        self._watermark = 0
+        self.rebuilds = 0
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._tree_rowids) + len(self._delta_rowids)
+
+    def _load(self):
+        meta_path = self.path / "meta.json"
+        if not meta_path.exists():
+            return
+        try:
+            meta = json.loads(meta_path.read_text())
+            with open(self.path / "tree.pkl", "rb") as f:
+                tree = pickle.load(f)
+            rowids = np.load(self.path / "rowids.npy")
+        except (OSError, ValueError, pickle.UnpicklingError):
+            return
+        if tree.n != len(rowids) or meta.get("watermark", 0) > self.repository.max_rowid():
+            return  # stale index (database replaced): rebuild from scratch
+        self._tree, self._tree_rowids = tree, rowids
+        self._tree_watermark = self._watermark = int(meta["watermark"])
+
+    def save(self):
+        """Persist the tree and its watermark (atomic per file, meta last)"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / "tree.pkl.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self._tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path / "tree.pkl")
+
+        tmp = self.path / "rowids.tmp.npy"
+        np.save(tmp, self._tree_rowids)
+        os.replace(tmp, self.path / "rowids.npy")
+
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps({"watermark": self._tree_watermark, "count": len(self._tree_rowids)}))
+        os.replace(tmp, self.path / "meta.json")
+
+    def _rebuild(self):
+        points = self._delta_points
+        rowids = self._delta_rowids
+        if self._tree is not None:
+            points = np.concatenate([self._tree.data, points])
+            rowids = np.concatenate([self._tree_rowids, rowids])
+        self._tree = cKDTree(points) if len(points) else None
+        self._tree_rowids = rowids
+        self._tree_watermark = self._watermark
+        self._delta_points = np.empty((0, 3), dtype=np.float64)
+        self._delta_rowids = np.empty(0, dtype=np.int64)
+        self.rebuilds += 1
+        self.save()
+
+    def sync(self) -> int:
+        """Pick up rows inserted since the last sync; returns rows added"""
+        with self._lock:
+            rowids, points = self.repository.errors_after(self._watermark)
+            if not len(rowids):
+                return 0
+            self._delta_points = np.concatenate([self._delta_points, points])
+            self._delta_rowids = np.concatenate([self._delta_rowids, rowids])
+            self._watermark = int(rowids[-1])
+
+            threshold = max(self.min_rebuild, self.rebuild_fraction * len(self._tree_rowids))
+            if len(self._delta_rowids) >= threshold or self._tree is None:
+                self._rebuild()
+            return len(rowids)
+
+    def query(self, tonic: float, octave: float, fifth: float, k: int = 5) -> List[Tuple[int, float]]:
+        """(rowid, distance) of the k nearest stored errors, nearest first"""
+        point = np.array([tonic, octave, fifth], dtype=np.float64)
+        with self._lock:
+            tree, tree_rowids = self._tree, self._tree_rowids
+            delta_points, delta_rowids = self._delta_points, self._delta_rowids
+
+        distances, rowids = [], []
+        if tree is not None:
+            kk = min(k, tree.n)
+            d, i = tree.query(point, k=kk)
+            distances.append(np.atleast_1d(d))
+            rowids.append(tree_rowids[np.atleast_1d(i)])
+        if len(delta_rowids):
+            distances.append(np.sqrt(((delta_points - point) ** 2).sum(axis=1)))
+            rowids.append(delta_rowids)
+        if not distances:
+            return []
+
+        distances = np.concatenate(distances)
+        rowids = np.concatenate(rowids)
+        order = np.argsort(distances, kind="stable")[:k]
+        return [(int(rowids[i]), float(distances[i])) for i in order]
+
+    def nearest(self, tonic: float, octave: float, fifth: float, k: int = 5) -> List[Dict]:
+        """Stored hit points nearest to the given errors, with a 'distance' field"""
+        self.sync()
+        matches = self.query(tonic, octave, fifth, k)
+        records = self.repository.get_by_rowids([rowid for rowid, _ in matches])
+        return [dict(records[rowid], distance=distance) for rowid, distance in matches if rowid in records]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tree_size": len(self._tree_rowids),
+            "delta_size": len(self._delta_rowids),
+            "watermark": self._watermark,
+            "rebuilds": self.rebuilds,
+        }
+
+
+_index: Optional[HitPointIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_hit_point_index() -> HitPointIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = HitPointIndex()
+    return _index
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Hit Points Repository: Local SQLite mirror of the hit_points table
+
+Columns follow tuning-console/supabase/schema.sql plus the compound
+target and hammering type migrations, with an extra 'note' column.
+The database runs in WAL mode; each thread (and process) reuses its
+own connection.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+from pathlib import Path
+import os
+import sqlite3
+import threading
+import uuid
+
+import numpy as np
+
+from models.tonefield_solver import hit_point_columns
+from models.impact_power import HAMMERING_TYPE_NAMES, solve_impact
+
+
+DB_PATH_ENV_VAR = "TUNING_LAB_DB"
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "hit_points.db"
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS hit_points (
+    id TEXT PRIMARY KEY,
+
+    -- tuning errors (Hz)
+    tonic REAL NOT NULL,
+    octave REAL NOT NULL,
+    fifth REAL NOT NULL,
+    note TEXT,
+
+    -- targets (compound target migration)
+    tuning_target TEXT CHECK (tuning_target IN ('tonic', 'octave', 'fifth')),
+    primary_target TEXT CHECK (primary_target IN ('tonic', 'octave', 'fifth')),
+    auxiliary_target TEXT CHECK (auxiliary_target IN ('tonic', 'octave', 'fifth')),
+    is_compound INTEGER NOT NULL DEFAULT 0,
+    target_display TEXT,
+
+    -- tonefield coordinate
+    coordinate_x REAL NOT NULL,
+    coordinate_y REAL NOT NULL,
+
+    -- hit attributes
+    strength REAL NOT NULL,
+    hit_count INTEGER,
+    location TEXT NOT NULL CHECK (location IN ('internal', 'external')),
+    intent TEXT NOT NULL,
+    hammering_type TEXT CHECK (hammering_type IN ('SNAP', 'PULL', 'PRESS')),
+
+    created_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_hit_points_created_at ON hit_points(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_hit_points_note_created_at ON hit_points(note, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_hit_points_location_target ON hit_points(location, tuning_target);
+"""
+
+COLUMNS = (
+    "id", "tonic", "octave", "fifth", "note",
+    "tuning_target", "primary_target", "auxiliary_target", "is_compound", "target_display",
+    "coordinate_x", "coordinate_y",
+    "strength", "hit_count", "location", "intent", "hammering_type",
+    "created_at",
+)
+FILTER_COLUMNS = ("note", "location", "tuning_target", "primary_target", "hammering_type")
+
+_INSERT_SQL = (
+    f"INSERT INTO hit_points ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join(':' + c for c in COLUMNS)})"
+)
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _normalize_timestamp(value) -> str:
+    """ISO-8601 UTC text with fixed precision, so string order is time order"""
+    if value is None:
+        return _utc_now()
+    ts = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def encode_cursor(row: Dict) -> str:
+    return f"{row['created_at']}|{row['id']}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    created_at, sep, row_id = cursor.rpartition("|")
+    if not sep:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return created_at, row_id
+
+
+def records_from_errors(tonic, octave, fifth, note: Optional[str] = None) -> List[Dict]:
+    """Compute full hit_points records (coordinate, targets, impact) for tuning errors"""
+    solution, impact = solve_impact(
+        np.atleast_1d(np.asarray(tonic, dtype=np.float64)),
+        np.atleast_1d(np.asarray(octave, dtype=np.float64)),
+        np.atleast_1d(np.asarray(fifth, dtype=np.float64)),
+    )
+    columns = {name: values.tolist() for name, values in hit_point_columns(solution).items()}
+    columns["tonic"] = np.atleast_1d(tonic).tolist()
+    columns["octave"] = np.atleast_1d(octave).tolist()
+    columns["fifth"] = np.atleast_1d(fifth).tolist()
+    columns["tuning_target"] = columns["primary_target"]
+    columns["strength"] = impact.force.tolist()
+    columns["hit_count"] = impact.count.tolist()
+    columns["hammering_type"] = np.array(HAMMERING_TYPE_NAMES)[impact.hammering_type].tolist()
+
+    count = len(columns["tonic"])
+    return [
+        dict({name: values[i] for name, values in columns.items()}, note=note)
+        for i in range(count)
+    ]
+
+
+class HitPointsRepository:
+    """
+    SQLite hit_points store
+
+    Args:
+        path: Database file (':memory:' is not supported: every thread
+            opens its own connection)
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or os.environ.get(DB_PATH_ENV_VAR, DEFAULT_DB_PATH))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self.connection().executescript(SCHEMA_SQL)
+
+    def connection(self) -> sqlite3.Connection:
+        """Per-thread connection, reopened after fork"""
+        if self._pid != os.getpid():
+            self._local = threading.local()
+            self._pid = os.getpid()
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row(record: Dict) -> Dict:
+        row = {c: record.get(c) for c in COLUMNS}
+        row["id"] = row["id"] or str(uuid.uuid4())
+        row["created_at"] = _normalize_timestamp(row["created_at"])
+        row["is_compound"] = int(bool(row["is_compound"]))
+        return row
+
+    def insert_many(self, records: Iterable[Dict]) -> List[str]:
+        """Insert records in one transaction (executemany); returns their ids"""
+        rows = [self._row(r) for r in records]
+        conn = self.connection()
+        with conn:
+            conn.executemany(_INSERT_SQL, rows)
+        return [r["id"] for r in rows]
+
+    def insert(self, record: Dict) -> str:
+        return self.insert_many([record])[0]
+
+    def get(self, row_id: str) -> Optional[Dict]:
+        row = self.connection().execute("SELECT * FROM hit_points WHERE id = ?", (row_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        record = dict(row)
+        record["is_compound"] = bool(record["is_compound"])
+        return record
+
+    def page(self, limit: int = 100, cursor: Optional[str] = None,
+             **filters: Optional[str]) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Newest-first keyset pagination
+
+        Args:
+            limit: Page size
+            cursor: next_cursor from the previous page
+            filters: Equality filters on FILTER_COLUMNS
+
+        Returns:
+            Tuple[rows, next_cursor] (next_cursor is None on the last page)
+        """
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter on '{column}'")
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if cursor:
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT * FROM hit_points {where} ORDER BY created_at DESC, id DESC LIMIT ?"
+        rows = [self._to_dict(r) for r in self.connection().execute(sql, (*params, limit + 1))]
+
+        next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def recent(self, note: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        return self.page(limit=limit, note=note)[0]
+
+    def count(self) -> int:
+        return self.connection().execute("SELECT COUNT(*) FROM hit_points").fetchone()[0]
+
+    def max_rowid(self) -> int:
+        return self.connection().execute("SELECT COALESCE(MAX(rowid), 0) FROM hit_points").fetchone()[0]
+
+    def errors_after(self, rowid: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(rowids, (n, 3) tonic/octave/fifth) of rows inserted after the given rowid"""
+        rows = self.connection().execute(
+            "SELECT rowid, tonic, octave, fifth FROM hit_points WHERE rowid > ? ORDER BY rowid",
+            (int(rowid),)
+        ).fetchall()
+        data = np.array([tuple(r) for r in rows], dtype=np.float64).reshape(-1, 4)
+        return data[:, 0].astype(np.int64), data[:, 1:]
+
+    def get_by_rowids(self, rowids: Sequence[int]) -> Dict[int, Dict]:
+        """Rows keyed by rowid (missing rowids are absent)"""
+        rowids = [int(r) for r in rowids]
+        if not rowids:
+            return {}
+        placeholders = ", ".join("?" * len(rowids))
+        rows = self.connection().execute(
+            f"SELECT rowid AS _rowid, * FROM hit_points WHERE rowid IN ({placeholders})", rowids
+        )
+        found = {}
+        for row in rows:
+            record = self._to_dict(row)
+            found[record.pop("_rowid")] = record
+        return found
+
+    def iter_columns(self, columns: Sequence[str], batch_size: int = 10000):
+        """Yield lists of rows (tuples of the given columns) in insertion order"""
+        for column in columns:
+            if column not in COLUMNS:
+                raise ValueError(f"Unknown column '{column}'")
+        cur = self.connection().execute(f"SELECT {', '.join(columns)} FROM hit_points ORDER BY rowid")
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [tuple(r) for r in rows]
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_repository: Optional[HitPointsRepository] = None
+_repository_lock = threading.Lock()
+
+
+def get_hit_points_repository() -> HitPointsRepository:
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = HitPointsRepository()
+    return _repository
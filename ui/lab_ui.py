@@ -10,6 +10,7 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import numpy as np
 import plotly.graph_objects as go
+import io
 from streamlit_plotly_events import plotly_events
 import sys
 from pathlib import Path
@@ -18,7 +19,12 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from config.physics_config import get_physics_config
 from models.hit_model import get_active_model
+from storage.experiment_store import get_experiment_store
+
+
+CLICK_GRID_STEP = 0.02  # click capture resolution (normalized coordinates)
 
 
 def create_tonefield_plot(L: float = 0, S: float = 0, strength: float = 0):
@@ -86,35 +92,45 @@ def create_tonefield_plot(L: float = 0, S: float = 0, strength: float = 0):
     return fig
 
 
-def main():
-    """Streamlit main application"""
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_tonefield_plot(L: float = 0, S: float = 0, strength: float = 0) -> bytes:
+    """PNG of create_tonefield_plot; the figure is closed once rendered"""
+    fig = create_tonefield_plot(L, S, strength)
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
 
-    # Page config
-    st.set_page_config(
-        page_title="Tuning Lab",
-        page_icon="🎹",
-        layout="wide"
-    )
 
-    # Initialize session state for selected coordinates
-    if 'selected_coords' not in st.session_state:
-        st.session_state['selected_coords'] = []
+@st.cache_resource(show_spinner=False)
+def static_tonefield_figure(radius_x: float, radius_y: float) -> go.Figure:
+    """
+    Static layers of the interactive tonefield (shared across reruns, never mutated)
 
-    # Create interactive Plotly coordinate system
+    Clicks are captured by one transparent heatmap whose cells are
+    CLICK_GRID_STEP wide, instead of a grid of invisible markers.
+    """
     fig = go.Figure()
 
-    # Tonefield parameters
-    a = 0.60  # short axis (S direction)
-    b = 0.85  # long axis (L direction)
+    # Click capture layer (bottom): one z value per cell, no hover labels
+    steps = int(round(2.0 / CLICK_GRID_STEP)) + 1
+    fig.add_trace(go.Heatmap(
+        z=np.zeros((steps, steps), dtype=np.int8),
+        x0=-1.0, dx=CLICK_GRID_STEP,
+        y0=-1.0, dy=CLICK_GRID_STEP,
+        colorscale=[[0, 'rgba(0,0,0,0)'], [1, 'rgba(0,0,0,0)']],
+        showscale=False,
+        hoverinfo='none',
+        name='Click capture'
+    ))
 
     # Add tonefield ellipse (using Scatter with fill)
     theta = np.linspace(0, 2*np.pi, 400)
-    ellipse_x = a * np.cos(theta)
-    ellipse_y = b * np.sin(theta)
-
     fig.add_trace(go.Scatter(
-        x=ellipse_x,
-        y=ellipse_y,
+        x=radius_x * np.cos(theta),
+        y=radius_y * np.sin(theta),
         mode='lines',
         name='Tonefield',
         line=dict(color='gray'),
@@ -137,23 +153,6 @@ def main():
     fig.add_shape(type="line", x0=0, y0=-1.2, x1=0, y1=1.2,
                   line=dict(color="black", width=2))
 
-    # Add invisible grid of clickable points (100x100 grid)
-    x_grid = np.linspace(-1, 1, 100)
-    y_grid = np.linspace(-1, 1, 100)
-    xx, yy = np.meshgrid(x_grid, y_grid)
-    x_flat = xx.flatten()
-    y_flat = yy.flatten()
-
-    fig.add_trace(go.Scatter(
-        x=x_flat,
-        y=y_flat,
-        mode='markers',
-        marker=dict(size=1, color='rgba(0,0,0,0)', opacity=0),  # Invisible
-        hoverinfo='skip',
-        showlegend=False,
-        name='Grid'
-    ))
-
     # Add origin marker
     fig.add_trace(go.Scatter(
         x=[0], y=[0],
@@ -163,20 +162,7 @@ def main():
         hoverinfo='skip'
     ))
 
-    # Add previously selected coordinates
-    if st.session_state['selected_coords']:
-        xs = [p[0] for p in st.session_state['selected_coords']]
-        ys = [p[1] for p in st.session_state['selected_coords']]
-        fig.add_trace(go.Scatter(
-            x=xs,
-            y=ys,
-            mode='markers',
-            marker=dict(color='green', size=8, symbol='x'),
-            name='Selected Points',
-            hoverinfo='skip'
-        ))
-
-    # Update layout - DISABLE all zoom/pan interactions
+    # DISABLE all zoom/pan interactions
     fig.update_xaxes(
         range=[-1.2, 1.2],
         zeroline=False,
@@ -199,8 +185,41 @@ def main():
         plot_bgcolor='white',
         margin=dict(l=40, r=40, t=60, b=40),
         dragmode=False,  # Disable drag-to-zoom
-        hovermode=False  # Disable hover interactions
+        hovermode='closest'  # click events need hover picking; labels are off per trace
     )
+    return fig
+
+
+def main():
+    """Streamlit main application"""
+
+    # Page config
+    st.set_page_config(
+        page_title="Tuning Lab",
+        page_icon="🎹",
+        layout="wide"
+    )
+
+    # Initialize session state for selected coordinates
+    if 'selected_coords' not in st.session_state:
+        st.session_state['selected_coords'] = []
+
+    # Static layers are cached; only the selected points are added per rerun
+    physics = get_physics_config()
+    fig = go.Figure(static_tonefield_figure(physics.tonefield_radius_x, physics.tonefield_radius_y))
+
+    # Add previously selected coordinates
+    if st.session_state['selected_coords']:
+        xs = [p[0] for p in st.session_state['selected_coords']]
+        ys = [p[1] for p in st.session_state['selected_coords']]
+        fig.add_trace(go.Scatter(
+            x=xs,
+            y=ys,
+            mode='markers',
+            marker=dict(color='green', size=8, symbol='x'),
+            name='Selected Points',
+            hoverinfo='skip'
+        ))
 
     # Display info message
     st.info("👆 Click anywhere on the plot to select coordinates")
@@ -216,43 +235,13 @@ def main():
         override_width=700
     )
 
-    # DEBUG: Show raw click data with multiple formats
-    st.write("**DEBUG - Raw click data (length):**", len(clicks))
-    st.write("**DEBUG - Raw click data (str):**", str(clicks))
-    st.json(clicks)  # JSON format shows structure better
-
-    # Handle click event
-    if clicks and len(clicks) > 0:
-        st.write("**DEBUG - clicks[0] type:**", type(clicks[0]))
-        st.write("**DEBUG - clicks[0] keys:**", list(clicks[0].keys()) if isinstance(clicks[0], dict) else "Not a dict")
-        st.write("**DEBUG - clicks[0] full:**", str(clicks[0]))
-
-        # Try to extract coordinates
-        try:
-            if isinstance(clicks[0], dict):
-                st.write("**DEBUG - All click data:**")
-                for key, value in clicks[0].items():
-                    st.write(f"  - {key}: {value}")
-
-                if 'x' in clicks[0] and 'y' in clicks[0]:
-                    x_c = float(clicks[0]["x"])
-                    y_c = float(clicks[0]["y"])
-                    st.write(f"**DEBUG - Extracted coordinates:** x={x_c}, y={y_c}")
-
-                    # Add to selected coordinates
-                    new_coord = (round(x_c, 3), round(y_c, 3))
-                    if new_coord not in st.session_state['selected_coords']:
-                        st.session_state['selected_coords'].append(new_coord)
-                        st.success(f"✅ Added: ({new_coord[0]}, {new_coord[1]})")
-                        st.rerun()
-                else:
-                    st.warning(f"⚠️ Click data missing 'x' or 'y' keys. Available keys: {list(clicks[0].keys())}")
-            else:
-                st.error(f"❌ clicks[0] is not a dict, it's a {type(clicks[0])}")
-        except Exception as e:
-            st.error(f"❌ Error processing click: {str(e)}")
-            import traceback
-            st.code(traceback.format_exc())
+    # Handle click event (clicks land on a click-capture cell center)
+    if clicks and isinstance(clicks[0], dict) and 'x' in clicks[0] and 'y' in clicks[0]:
+        new_coord = (round(float(clicks[0]["x"]), 3), round(float(clicks[0]["y"]), 3))
+        if new_coord not in st.session_state['selected_coords']:
+            st.session_state['selected_coords'].append(new_coord)
+            st.success(f"✅ Added: ({new_coord[0]}, {new_coord[1]})")
+            st.rerun()
 
     # Display selected coordinates
     if st.session_state['selected_coords']:
@@ -397,20 +386,40 @@ def main():
                 st.metric("Strength", f"{strength:.2f}")
 
             # Tonefield plot
-            fig = create_tonefield_plot(L, S, strength)
-            st.pyplot(fig)
+            st.image(render_tonefield_plot(L, S, strength))
 
         else:
             # Initial state: empty plot
             st.info("👈 Enter tuning errors and click 'Predict Hit Point' button")
-            fig = create_tonefield_plot()
-            st.pyplot(fig)
+            st.image(render_tonefield_plot())
 
-    # Bottom: Save experiment data (future feature)
+    # Bottom: Save experiment data
     st.markdown("---")
-    with st.expander("💾 Save Experiment Data (Coming Soon)"):
-        st.write("Save experimental data to samples.json")
-        st.write("To be implemented")
+    with st.expander("💾 Save Experiment Data"):
+        if st.session_state.get('prediction_made', False):
+            note_name = st.text_input("Note name", value="", placeholder="e.g., A4")
+            if st.button("💾 Save Sample", use_container_width=True):
+                model = get_active_model()
+                model_info = model.get_model_info()
+                L, S, strength = model.predict(
+                    st.session_state['tonic'],
+                    st.session_state['octave'],
+                    st.session_state['fifth']
+                )
+                get_experiment_store().append({
+                    "note": note_name or None,
+                    "input": {
+                        "tonic": st.session_state['tonic'],
+                        "octave": st.session_state['octave'],
+                        "fifth": st.session_state['fifth']
+                    },
+                    "output": {"L": L, "S": S, "strength": strength},
+                    "model_name": model_info['name'],
+                    "model_version": model_info['version']
+                })
+                st.success(f"✅ Saved to {get_experiment_store().root}")
+        else:
+            st.write("Make a prediction first to save it as an experiment sample")
 
 
 if __name__ == "__main__":